@@ -0,0 +1,160 @@
+import time
+import queue
+import logging
+import threading
+from typing import Iterable
+
+from roulette_result import RouletteResult
+from config import Config
+
+FSYNC_POLICIES = ("always", "interval", "os")
+
+class BackgroundResultWriter:
+    """Persists results on a writer thread, group-committing whatever has queued up"""
+
+    def __init__(self, store, queue_size: int = None, fsync_policy: str = None,
+                 fsync_interval_ms: int = None, max_batch: int = None):
+        self.store = store
+        self.fsync_policy = (fsync_policy or Config.PERSIST_FSYNC_POLICY).lower()
+        self.fsync_interval = (fsync_interval_ms or Config.PERSIST_FSYNC_INTERVAL_MS) / 1000
+        self.max_batch = max_batch or Config.PERSIST_MAX_BATCH
+        self.logger = logging.getLogger(__name__)
+
+        if self.fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {self.fsync_policy}")
+
+        self._queue = queue.Queue(maxsize=queue_size or Config.PERSIST_QUEUE_SIZE)
+        self._stop = object()
+        self._closed = False
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        self.stats = {
+            "written": 0,
+            "commits": 0,
+            "syncs": 0,
+            "largest_commit": 0,
+            "errors": 0
+        }
+
+        self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, result: RouletteResult):
+        """Queue a result for the writer thread"""
+        if self._closed:
+            # The writer thread is gone; write through rather than queue into nothing
+            self._commit([result])
+            return
+        try:
+            self._queue.put_nowait(result)
+        except queue.Full:
+            # Back-pressure rather than losing results
+            self.logger.warning("Persistence queue full, waiting for the writer to catch up")
+            self._queue.put(result)
+
+    def append_many(self, results: Iterable[RouletteResult]):
+        """Queue several results for the writer thread"""
+        for result in results:
+            self.append(result)
+
+    def flush(self):
+        """Block until every queued result has been written"""
+        self._queue.join()
+
+    def recent(self, table_name: str, limit: int) -> list:
+        """Get the newest results for a table once everything queued has been written"""
+        self.flush()
+        return self.store.recent(table_name, limit)
+
+    def _run(self):
+        while True:
+            try:
+                # Wake up at least once per interval so a quiet table still gets synced
+                item = self._queue.get(timeout=self.fsync_interval if self._dirty else None)
+            except queue.Empty:
+                self._sync_if_due()
+                continue
+
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # An append racing close() can land after the sentinel, in the same batch
+            stopping = any(item is self._stop for item in batch)
+            results = [r for r in batch if r is not self._stop]
+
+            if results:
+                self._commit(results)
+
+            for _ in batch:
+                self._queue.task_done()
+
+            if stopping:
+                return
+
+    def _commit(self, results: list):
+        """Write one group of results and sync according to the policy"""
+        try:
+            self.store.append_many(results)
+            self.stats["written"] += len(results)
+            self.stats["commits"] += 1
+            self.stats["largest_commit"] = max(self.stats["largest_commit"], len(results))
+
+            if self.fsync_policy == "always":
+                self._sync()
+            elif self.fsync_policy == "interval":
+                self._dirty = True
+                self._sync_if_due()
+
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.error(f"Error persisting {len(results)} results: {str(e)}")
+
+    def _sync_if_due(self):
+        if self._dirty and time.monotonic() - self._last_sync >= self.fsync_interval:
+            self._sync()
+
+    def _sync(self):
+        try:
+            self.store.sync()
+            self.stats["syncs"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.error(f"Error syncing result store: {str(e)}")
+        self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Drain the queue, stop the writer thread and close the store"""
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(self._stop)
+            self._thread.join()
+
+        # Appends that raced close() and were queued behind the last batch
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+            if item is not self._stop:
+                leftover.append(item)
+        if leftover:
+            self._commit(leftover)
+
+        if self._dirty:
+            self._sync()
+        self.store.close()
+
+    def get_status(self) -> dict:
+        """Get writer status"""
+        return {
+            "queue_depth": self._queue.qsize(),
+            "fsync_policy": self.fsync_policy,
+            **self.stats
+        }
@@ -7,7 +7,6 @@ Connects to running Chrome browser using DevTools Protocol
 import time
 import logging
 import json
-import requests
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -18,6 +17,12 @@ from datetime import datetime
 from typing import Optional
 
 from roulette_result import RouletteResult, get_color_for_number
+from dedupe_state import DedupeState
+from dom_sweep import sweep_selectors, iter_candidates
+from page_observer import PageObserver, entry_timestamp
+from cdp_client import CDPClient, CDPResultStream, CDPError, CDP_AVAILABLE, find_page_target
+from selector_stats import SelectorStats, HIT, SEEN, MISS
+from http_transport import get_session
 from config import Config
 
 class BrowserConnector:
@@ -28,7 +33,13 @@ class BrowserConnector:
         self.driver = None
         self.last_result = None
         self.result_history = []
+        self.dedupe = DedupeState()
+        self._detected_round_id = None
         self.session_start_time = None
+        self.observer = None
+        self.push_wait = 0.0
+        self.selector_stats = SelectorStats()
+        self.cdp = None
     
     def connect_to_existing_browser(self) -> bool:
         """Connect to existing Chrome browser session"""
@@ -63,7 +74,7 @@ class BrowserConnector:
         
         for port in common_ports:
             try:
-                response = requests.get(f"http://localhost:{port}/json/version", timeout=2)
+                response = get_session().get(f"http://localhost:{port}/json/version", timeout=2)
                 if response.status_code == 200:
                     ports.append(port)
                     self.logger.info(f"Found Chrome debug port: {port}")
@@ -88,10 +99,14 @@ class BrowserConnector:
             if "betfury.io" in current_url or "evolution" in current_url.lower():
                 self.logger.info("Already on casino page!")
                 self.session_start_time = datetime.now()
-                return True
+                connected = True
             else:
                 self.logger.info("Not on casino page. Navigating...")
-                return self._navigate_to_casino()
+                connected = self._navigate_to_casino()
+            
+            if connected and Config.BROWSER_BACKEND == "cdp":
+                self._attach_cdp(port)
+            return connected
                 
         except Exception as e:
             self.logger.error(f"Failed to connect to port {port}: {str(e)}")
@@ -111,12 +126,35 @@ class BrowserConnector:
             self.driver = webdriver.Chrome(options=chrome_options)
             
             # Navigate to casino
-            return self._navigate_to_casino()
+            connected = self._navigate_to_casino()
+            
+            if connected and Config.BROWSER_BACKEND == "cdp":
+                self._attach_cdp(9222)
+            return connected
             
         except Exception as e:
             self.logger.error(f"Failed to start Chrome with debug: {str(e)}")
             return False
     
+    def _attach_cdp(self, port: int):
+        """Open a DevTools WebSocket alongside Selenium so results arrive as events"""
+        if not CDP_AVAILABLE:
+            self.logger.warning("websocket-client not available - results will be polled through Selenium")
+            return
+        
+        try:
+            target = find_page_target(port, ("betfury.io", "evolution"))
+            if not target:
+                self.logger.warning(f"No page target on debug port {port}")
+                return
+            
+            self.cdp = CDPClient(target["webSocketDebuggerUrl"])
+            self.cdp.connect()
+            self.logger.info(f"DevTools backend attached: {target.get('url')}")
+        except Exception as e:
+            self.logger.warning(f"Could not attach DevTools backend: {str(e)}")
+            self.cdp = None
+    
     def _navigate_to_casino(self) -> bool:
         """Navigate to casino page"""
         try:
@@ -162,6 +200,7 @@ class BrowserConnector:
     
     def detect_result(self) -> Optional[RouletteResult]:
         """Detect roulette result from current page"""
+        self.push_wait = 0.0
         try:
             # Check if we're still on the right page
             current_url = self.driver.current_url
@@ -240,10 +279,22 @@ class BrowserConnector:
                 ".live-winning-number"
             ]
             
+            if Config.DOM_DETECTION_MODE == "push":
+                return self._detect_via_observer(selectors)
+            
+            # Proven selectors first; ones that never match are only rescanned now and then
+            selectors = self.selector_stats.ranked(selectors)
+            
+            if Config.DOM_DETECTION_MODE == "sweep":
+                return self._detect_via_sweep(selectors)
+            
             for selector in selectors:
+                outcome = MISS
                 try:
                     # Try to find element
+                    start = time.monotonic()
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    self.selector_stats.lookup(selector, time.monotonic() - start)
                     
                     for element in elements:
                         text = element.text.strip()
@@ -261,14 +312,21 @@ class BrowserConnector:
                             )
                             
                             if self._is_new_result(result):
+                                self.selector_stats.record(selector, HIT)
                                 self.logger.info(f"Result detected via DOM ({selector}): {number} ({color})")
                                 return result
+                            outcome = SEEN
                                 
                 except (TimeoutException, NoSuchElementException):
-                    continue
+                    pass
                 except Exception as e:
                     self.logger.debug(f"Error with selector {selector}: {str(e)}")
-                    continue
+                
+                self.selector_stats.record(selector, outcome)
+                
+                # A trusted selector still showing the last result means there is nothing new
+                if outcome == SEEN and self.selector_stats.settled(selector):
+                    return None
             
             return None
             
@@ -276,6 +334,80 @@ class BrowserConnector:
             self.logger.debug(f"DOM detection failed: {str(e)}")
             return None
     
+    def _detect_via_sweep(self, selectors: list) -> Optional[RouletteResult]:
+        """Detect result by running every selector in a single script round trip"""
+        candidates = list(iter_candidates(sweep_selectors(self.driver, selectors)))
+        matched = {selector for selector, _, _ in candidates}
+        for selector in selectors:
+            if selector not in matched:
+                self.selector_stats.record(selector, MISS)
+        
+        for selector, number, round_id in candidates:
+            color = get_color_for_number(number)
+            
+            result = RouletteResult(
+                number=number,
+                color=color,
+                timestamp=datetime.now(),
+                table_name=Config.TABLE_NAME,
+                session_id=self._get_session_id()
+            )
+            
+            if self._is_new_result(result, round_id):
+                self.selector_stats.record(selector, HIT)
+                self._detected_round_id = round_id
+                self.logger.info(f"Result detected via DOM sweep ({selector}): {number} ({color})")
+                return result
+            
+            # A trusted selector still showing the last result means there is nothing new
+            if selector in matched:
+                matched.discard(selector)
+                self.selector_stats.record(selector, SEEN)
+                if self.selector_stats.settled(selector):
+                    return None
+        
+        return None
+    
+    def _detect_via_observer(self, selectors: list) -> Optional[RouletteResult]:
+        """Take the next result pushed by the in-page observer, waiting up to PUSH_WAIT_MS for one"""
+        if self.cdp is not None and self.observer is None:
+            try:
+                self.observer = CDPResultStream(self.cdp, selectors)
+            except CDPError as e:
+                self.logger.warning(f"DevTools result stream failed: {str(e)}")
+                self.cdp.close()
+        
+        if self.cdp is not None and not self.cdp.connected:
+            # The DevTools socket dropped; carry on through Selenium
+            self.logger.warning("DevTools backend disconnected - falling back to Selenium")
+            self.cdp = None
+            self.observer = None
+        
+        if self.observer is None or (self.cdp is None and self.observer.driver is not self.driver):
+            self.observer = PageObserver(self.driver, selectors)
+        
+        entry = self.observer.next_entry()
+        self.push_wait = self.observer.waited
+        while entry:
+            number = entry["number"]
+            color = get_color_for_number(number)
+            
+            result = RouletteResult(
+                number=number,
+                color=color,
+                timestamp=entry_timestamp(entry),
+                table_name=Config.TABLE_NAME,
+                session_id=self._get_session_id()
+            )
+            
+            if self._is_new_result(result, entry.get("roundId")):
+                self._detected_round_id = entry.get("roundId")
+                self.logger.info(f"Result detected via observer ({entry['selector']}): {number} ({color})")
+                return result
+            entry = self.observer.next_entry(wait=False)
+        
+        return None
+    
     def _is_valid_number(self, text: str) -> bool:
         """Check if text represents a valid roulette number"""
         try:
@@ -284,17 +416,10 @@ class BrowserConnector:
         except ValueError:
             return False
     
-    def _is_new_result(self, result: RouletteResult) -> bool:
+    def _is_new_result(self, result: RouletteResult, round_id: Optional[str] = None) -> bool:
         """Check if this is a new result (not duplicate)"""
-        if not self.last_result:
-            return True
-        
-        # Check if it's the same number and within a short time window
-        if (result.number == self.last_result.number and 
-            (result.timestamp - self.last_result.timestamp).seconds < 30):
-            return False
-        
-        return True
+        # Checked against persisted state, so a restart doesn't re-emit the last result
+        return not self.dedupe.is_duplicate(result, round_id)
     
     def _get_session_id(self) -> str:
         """Generate a session ID for tracking"""
@@ -305,12 +430,20 @@ class BrowserConnector:
     def update_result_history(self, result: RouletteResult):
         """Update the result history"""
         self.last_result = result
+        self.dedupe.record(result, self._detected_round_id)
+        self._detected_round_id = None
         self.result_history.append(result)
         
         # Keep only the last N results
         if len(self.result_history) > Config.RESULT_HISTORY_SIZE:
             self.result_history.pop(0)
     
+    def preload_history(self, results: list):
+        """Pre-fill the result history from persisted results, oldest first"""
+        self.result_history = list(results[-Config.RESULT_HISTORY_SIZE:])
+        if self.result_history:
+            self.last_result = self.result_history[-1]
+    
     def is_session_expired(self) -> bool:
         """Check if the session has expired (2 hours)"""
         if not self.session_start_time:
@@ -324,6 +457,9 @@ class BrowserConnector:
         try:
             self.driver.refresh()
             time.sleep(5)
+            # The reload dropped the in-page observer
+            if self.observer:
+                self.observer.arm()
             self.session_start_time = datetime.now()
             self.logger.info("Session refreshed successfully")
             return True
@@ -333,6 +469,10 @@ class BrowserConnector:
     
     def close(self):
         """Close the browser connection"""
+        self.dedupe.save()
+        self.selector_stats.save()
+        if self.cdp:
+            self.cdp.close()
         if self.driver:
             try:
                 self.driver.quit()
@@ -348,5 +488,7 @@ class BrowserConnector:
             "session_expired": self.is_session_expired(),
             "last_result": self.last_result.to_dict() if self.last_result else None,
             "result_count": len(self.result_history),
-            "current_url": self.driver.current_url if self.driver else None
+            "current_url": self.driver.current_url if self.driver else None,
+            "selectors": self.selector_stats.get_status(),
+            "cdp": self.cdp.get_status() if self.cdp else None
         }
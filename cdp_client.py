@@ -0,0 +1,241 @@
+import json
+import time
+import queue
+import base64
+import logging
+import itertools
+import threading
+from typing import Callable, List, Optional, Sequence
+
+from http_transport import get_session
+from page_observer import OBSERVER_SCRIPT, ArmBackoff
+from config import Config
+
+# websocket-client is only needed for the DevTools backend, so make it optional
+try:
+    import websocket
+    CDP_AVAILABLE = True
+except ImportError:
+    CDP_AVAILABLE = False
+
+class CDPError(Exception):
+    """A DevTools command failed or the connection was lost"""
+
+def find_page_target(port: int, url_hints: Sequence[str] = ()) -> Optional[dict]:
+    """Pick the page to attach to from Chrome's /json/list, preferring one whose URL matches a hint"""
+    targets = get_session().get(f"http://localhost:{port}/json/list", timeout=2).json()
+    pages = [t for t in targets if t.get("type") == "page" and t.get("webSocketDebuggerUrl")]
+
+    for target in pages:
+        url = target.get("url", "").lower()
+        if any(hint in url for hint in url_hints):
+            return target
+    return pages[0] if pages else None
+
+class CDPClient:
+    """DevTools WebSocket connection: commands can be sent from any thread, events go to listeners"""
+
+    def __init__(self, ws_url: str, timeout: float = None):
+        self.ws_url = ws_url
+        self.timeout = timeout or Config.CDP_COMMAND_TIMEOUT_SECONDS
+        self.logger = logging.getLogger(__name__)
+        self._ws = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._pending = {}
+        self._listeners = {}
+        self._reader = None
+        self.connected = False
+        self.events = 0
+
+    def connect(self):
+        if not CDP_AVAILABLE:
+            raise CDPError("websocket-client is not installed")
+
+        # Chrome refuses DevTools sockets that send an Origin it wasn't started to allow
+        self._ws = websocket.create_connection(self.ws_url, timeout=self.timeout, suppress_origin=True)
+        self._ws.settimeout(None)
+        self.connected = True
+        self._reader = threading.Thread(target=self._read, name="cdp-reader", daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        while self.connected:
+            try:
+                message = json.loads(self._ws.recv())
+            except Exception as e:
+                if self.connected:
+                    self.logger.warning(f"DevTools connection lost: {str(e)}")
+                break
+
+            if "id" in message:
+                with self._lock:
+                    waiter = self._pending.pop(message["id"], None)
+                if waiter:
+                    waiter[1] = message
+                    waiter[0].set()
+            elif "method" in message:
+                self.events += 1
+                # Listeners run on this thread, so they must not block or send commands
+                for callback in list(self._listeners.get(message["method"], ())):
+                    try:
+                        callback(message.get("params", {}))
+                    except Exception as e:
+                        self.logger.error(f"Error in {message['method']} listener: {str(e)}")
+
+        self.connected = False
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for waiter in pending.values():
+            waiter[0].set()
+
+    def on(self, method: str, callback: Callable[[dict], None]):
+        """Call callback(params) for every event with this method name"""
+        self._listeners.setdefault(method, []).append(callback)
+
+    def send(self, method: str, params: dict = None, timeout: float = None) -> dict:
+        """Send a command and wait for its result"""
+        if not self.connected:
+            raise CDPError("DevTools connection is closed")
+
+        message_id = next(self._ids)
+        waiter = [threading.Event(), None]
+        with self._lock:
+            self._pending[message_id] = waiter
+
+        try:
+            with self._send_lock:
+                self._ws.send(json.dumps({"id": message_id, "method": method, "params": params or {}}))
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(message_id, None)
+            raise CDPError(f"{method} could not be sent: {str(e)}")
+
+        if not waiter[0].wait(timeout or self.timeout):
+            with self._lock:
+                self._pending.pop(message_id, None)
+            raise CDPError(f"{method} timed out")
+
+        response = waiter[1]
+        if response is None:
+            raise CDPError(f"DevTools connection closed during {method}")
+        if "error" in response:
+            raise CDPError(f"{method} failed: {response['error'].get('message')}")
+        return response.get("result", {})
+
+    def enable(self, *domains: str):
+        for domain in domains:
+            self.send(f"{domain}.enable")
+
+    def evaluate(self, expression: str, await_promise: bool = False):
+        """Evaluate JavaScript in the page and return its value"""
+        result = self.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": await_promise
+        })
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CDPError(details.get("exception", {}).get("description") or details.get("text"))
+        return result.get("result", {}).get("value")
+
+    def screenshot(self, path: str = None) -> bytes:
+        """Capture the page as PNG, optionally writing it to path"""
+        data = base64.b64decode(self.send("Page.captureScreenshot", {"format": "png"})["data"])
+        if path:
+            with open(path, 'wb') as f:
+                f.write(data)
+        return data
+
+    def close(self):
+        self.connected = False
+        if self._ws:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+        if self._reader and self._reader is not threading.current_thread():
+            self._reader.join(timeout=2)
+
+    def get_status(self) -> dict:
+        return {
+            "connected": self.connected,
+            "url": self.ws_url,
+            "events": self.events
+        }
+
+class CDPResultStream:
+    """Push-mode results over DevTools: the page observer reports each number through a binding"""
+
+    BINDING = "__roulettePush"
+
+    def __init__(self, client: CDPClient, selectors: List[str], wait_ms: int = None, max_queue: int = 100):
+        self.client = client
+        self.selectors = list(selectors)
+        self.wait_ms = wait_ms or Config.PUSH_WAIT_MS
+        self.max_queue = max_queue
+        self.logger = logging.getLogger(__name__)
+        self._entries = queue.Queue()
+        self._backoff = ArmBackoff(self.logger)
+        self.armed = False
+        self.waited = 0.0
+
+        client.on("Runtime.bindingCalled", self._on_binding)
+        client.on("Runtime.consoleAPICalled", self._on_console)
+        client.on("Page.loadEventFired", self._on_load)
+        client.enable("Runtime", "Page")
+        # Bindings survive navigation, so this is only needed once per connection
+        client.send("Runtime.addBinding", {"name": self.BINDING})
+        self.arm()
+
+    def arm(self) -> bool:
+        """Install the observer in the current page; call again after a reload"""
+        # The last argument switches the observer to reporting through the binding only
+        arguments = json.dumps([self.selectors, self.max_queue, True])
+        try:
+            self.client.evaluate(f"(function() {{{OBSERVER_SCRIPT}}}).apply(null, {arguments})")
+            self.armed = True
+            self._backoff.succeeded()
+            self.logger.info("Result observer armed over DevTools")
+        except CDPError as e:
+            self.armed = False
+            self._backoff.failed(f"Could not arm result observer: {str(e)}")
+        return self.armed
+
+    def _on_binding(self, params: dict):
+        if params.get("name") != self.BINDING:
+            return
+        try:
+            self._entries.put(json.loads(params["payload"]))
+        except (KeyError, ValueError) as e:
+            self.logger.debug(f"Ignoring malformed observer payload: {str(e)}")
+
+    def _on_load(self, params: dict):
+        # The reload dropped the observer; wake the collector so it re-arms
+        self.armed = False
+        self._entries.put(None)
+
+    def _on_console(self, params: dict):
+        values = [str(arg.get("value", arg.get("description", ""))) for arg in params.get("args", [])]
+        self.logger.debug(f"console.{params.get('type')}: {' '.join(values)}")
+
+    def next_entry(self, wait: bool = True) -> Optional[dict]:
+        """Next pushed entry, waiting up to wait_ms for one when wait is set"""
+        self.waited = 0.0
+        if not self.armed and self._backoff.ready():
+            self.arm()
+
+        start = time.monotonic()
+        try:
+            entry = self._entries.get(timeout=self.wait_ms / 1000) if wait else self._entries.get_nowait()
+        except queue.Empty:
+            entry = False
+
+        if entry is None:
+            # Woken by a reload rather than a result
+            self.arm()
+            return None
+        if wait:
+            self.waited = time.monotonic() - start
+        return entry or None
@@ -0,0 +1,93 @@
+import time
+import logging
+import threading
+from typing import Callable
+
+from config import Config
+
+class CircuitBreaker:
+    """Stops calls to a failing sink and probes it in the background until it recovers"""
+
+    def __init__(self, name: str, probe: Callable[[], bool], failure_threshold: int = None,
+                 probe_interval: float = None):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold or Config.BREAKER_FAILURE_THRESHOLD
+        self.probe_interval = probe_interval or Config.BREAKER_PROBE_INTERVAL_SECONDS
+        self.logger = logging.getLogger(__name__)
+
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self.stats = {
+            "opened": 0,
+            "skipped": 0,
+            "probes": 0
+        }
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead; cheap, never touches the network"""
+        with self._condition:
+            if self.state == "closed":
+                return True
+            self.stats["skipped"] += 1
+            return False
+
+    def record_success(self):
+        with self._condition:
+            self.failures = 0
+
+    def record_failure(self):
+        with self._condition:
+            self.failures += 1
+            if self.state == "closed" and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.time()
+        self.stats["opened"] += 1
+        self.logger.warning(f"{self.name} circuit opened after {self.failures} consecutive failures")
+        threading.Thread(target=self._run_probe, name=f"{self.name}-probe", daemon=True).start()
+
+    def _run_probe(self):
+        while not self._stop.wait(self.probe_interval):
+            with self._condition:
+                self.stats["probes"] += 1
+            try:
+                recovered = self.probe()
+            except Exception:
+                recovered = False
+
+            if recovered:
+                with self._condition:
+                    self.state = "closed"
+                    self.failures = 0
+                    self._condition.notify_all()
+                self.logger.info(f"{self.name} circuit closed, sink recovered after "
+                                 f"{time.time() - self.opened_at:.0f}s")
+                return
+
+    def wait_closed(self, timeout: float = None) -> bool:
+        """Block until the circuit closes or the timeout passes"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.state == "closed", timeout)
+
+    def stop(self):
+        """Stop background probing"""
+        self._stop.set()
+
+    def get_status(self) -> dict:
+        with self._condition:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "open_for_seconds": round(time.time() - self.opened_at) if self.state == "open" else 0,
+                **self.stats
+            }
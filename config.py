@@ -10,6 +10,9 @@ class Config:
     
     # Discord Configuration
     DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "https://discord.com/api/webhooks/1403803810345910313/b6GOWbVb3mLUnPNnWkR9UsfNAjL6SErKl7bKNydHH7R_cM3og9qE6rdTCYdo_o8318D2")
+    # JSON list of destinations; empty sends everything to DISCORD_WEBHOOK_URL
+    # e.g. [{"name": "all", "webhook_url": "..."}, {"name": "vip", "webhook_url": "...", "tables": ["Lightning Roulette"], "workers": 2}]
+    DISCORD_ROUTES = os.getenv("DISCORD_ROUTES", "")
     
     # Casino Configuration
     CASINO_URL = os.getenv("CASINO_URL", "https://betfury.io/casino/games/immersive-roulette-by-evolution")
@@ -19,6 +22,8 @@ class Config:
     BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "false").lower() == "true"
     BROWSER_WIDTH = int(os.getenv("BROWSER_WIDTH", "1920"))
     BROWSER_HEIGHT = int(os.getenv("BROWSER_HEIGHT", "1080"))
+    BROWSER_BACKEND = os.getenv("BROWSER_BACKEND", "selenium")  # selenium, or cdp to receive push-mode results over DevTools
+    CDP_COMMAND_TIMEOUT_SECONDS = float(os.getenv("CDP_COMMAND_TIMEOUT_SECONDS", "10"))
     
     # Session Management
     SESSION_TIMEOUT_MINUTES = int(os.getenv("SESSION_TIMEOUT_MINUTES", "120"))  # 2 hours
@@ -27,11 +32,25 @@ class Config:
     
     # Scanning Configuration
     SCAN_INTERVAL_SECONDS = int(os.getenv("SCAN_INTERVAL_SECONDS", "1"))
+    DETECTION_BUDGET_SECONDS = float(os.getenv("DETECTION_BUDGET_SECONDS", "3"))  # deadline for one DOM detection cycle
+    # push (in-page observer, every collector), sweep (one script call per cycle) or per_selector.
+    # Only main_working.py and working_collector.py sweep; main.py, main_simple.py and main_stealth.py
+    # look selectors up one at a time within DETECTION_BUDGET_SECONDS unless the mode is push
+    DOM_DETECTION_MODE = os.getenv("DOM_DETECTION_MODE", "sweep")
+    # Longest one push-mode poll waits; a pushed result returns it at once. Capped below DETECTION_BUDGET_SECONDS,
+    # and the wait itself is not counted against the detection budget
+    PUSH_WAIT_MS = max(100, min(int(os.getenv("PUSH_WAIT_MS", "2000")), int(DETECTION_BUDGET_SECONDS * 1000) - 500))
     RESULT_HISTORY_SIZE = int(os.getenv("RESULT_HISTORY_SIZE", "100"))
+    WARM_START_LOOKBACK_DAYS = int(os.getenv("WARM_START_LOOKBACK_DAYS", "2"))  # days searched for recent history at startup
     
     # Local HTML System
     LOCAL_HTML_ENDPOINT = os.getenv("LOCAL_HTML_ENDPOINT", "http://localhost:3001/result")
     ENABLE_LOCAL_HTML = os.getenv("ENABLE_LOCAL_HTML", "true").lower() == "true"
+    ENABLE_LOCAL_FEED = os.getenv("ENABLE_LOCAL_FEED", "true").lower() == "true"  # Server-Sent Events feed at /events
+    FEED_HOST = os.getenv("FEED_HOST", "127.0.0.1")
+    FEED_PORT = int(os.getenv("FEED_PORT", "3002"))
+    FEED_REPLAY_SIZE = int(os.getenv("FEED_REPLAY_SIZE", "50"))  # results replayed to a new subscriber
+    LOCAL_HTML_BATCH_SIZE = int(os.getenv("LOCAL_HTML_BATCH_SIZE", "50"))  # results per /batch request when catching up
     
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -45,9 +64,65 @@ class Config:
     DATA_DIR = os.getenv("DATA_DIR", "data")
     SCREENSHOTS_DIR = os.getenv("SCREENSHOTS_DIR", "screenshots")
     
+    # Result Storage
+    RESULT_STORE_BACKEND = os.getenv("RESULT_STORE_BACKEND", "jsonl")  # jsonl, sqlite or binary
+    RESULT_DB_PATH = os.getenv("RESULT_DB_PATH", os.path.join(DATA_DIR, "results.db"))
+    RESULT_DB_BATCH_SIZE = int(os.getenv("RESULT_DB_BATCH_SIZE", "1"))
+    INDEX_BLOCK_SIZE = int(os.getenv("INDEX_BLOCK_SIZE", "256"))  # journal records per index block
+    
+    # Duplicate Detection (persisted across restarts)
+    DEDUPE_STATE_FILE = os.getenv("DEDUPE_STATE_FILE", os.path.join(DATA_DIR, "dedupe_state.json"))
+    DEDUPE_WINDOW_SECONDS = int(os.getenv("DEDUPE_WINDOW_SECONDS", "30"))
+    DEDUPE_MAX_ROUNDS = int(os.getenv("DEDUPE_MAX_ROUNDS", "100"))
+    DEDUPE_SAVE_INTERVAL_SECONDS = float(os.getenv("DEDUPE_SAVE_INTERVAL_SECONDS", "2"))  # coalesce state file writes
+    
+    # Selector Ranking (learned per table, persisted across restarts)
+    SELECTOR_STATS_FILE = os.getenv("SELECTOR_STATS_FILE", os.path.join(DATA_DIR, "selector_stats.json"))
+    SELECTOR_COLD_AFTER = int(os.getenv("SELECTOR_COLD_AFTER", "20"))  # consecutive misses before a selector is only rescanned
+    SELECTOR_RESCAN_CYCLES = int(os.getenv("SELECTOR_RESCAN_CYCLES", "50"))  # every Nth cycle tries every selector
+    
+    # Background Persistence
+    PERSIST_ASYNC = os.getenv("PERSIST_ASYNC", "true").lower() == "true"
+    PERSIST_QUEUE_SIZE = int(os.getenv("PERSIST_QUEUE_SIZE", "10000"))
+    PERSIST_MAX_BATCH = int(os.getenv("PERSIST_MAX_BATCH", "500"))
+    PERSIST_FSYNC_POLICY = os.getenv("PERSIST_FSYNC_POLICY", "interval")  # always, interval or os
+    PERSIST_FSYNC_INTERVAL_MS = int(os.getenv("PERSIST_FSYNC_INTERVAL_MS", "1000"))
+    
     # Notification Configuration
     ENABLE_DISCORD_NOTIFICATIONS = os.getenv("ENABLE_DISCORD_NOTIFICATIONS", "true").lower() == "true"
     ENABLE_CONSOLE_NOTIFICATIONS = os.getenv("ENABLE_CONSOLE_NOTIFICATIONS", "true").lower() == "true"
+    DISCORD_MAX_RETRIES = int(os.getenv("DISCORD_MAX_RETRIES", "3"))  # retries of a rate limited (429) message
+    
+    # Notification Delivery (background queues)
+    DELIVERY_QUEUE_SIZE = int(os.getenv("DELIVERY_QUEUE_SIZE", "1000"))
+    DELIVERY_WORKERS = int(os.getenv("DELIVERY_WORKERS", "1"))  # more than one may reorder messages
+    DELIVERY_OVERFLOW_POLICY = os.getenv("DELIVERY_OVERFLOW_POLICY", "merge")  # drop_oldest, drop_newest or merge
+    DISCORD_BATCH_WINDOW_MS = int(os.getenv("DISCORD_BATCH_WINDOW_MS", "0"))  # 0 sends each message on its own
+    DISCORD_DIGEST_SPINS = int(os.getenv("DISCORD_DIGEST_SPINS", "0"))  # >0 sends a summary every N spins instead of each result
+    DISCORD_DIGEST_MINUTES = float(os.getenv("DISCORD_DIGEST_MINUTES", "0"))  # >0 sends a summary every M minutes
+    DISCORD_BATCH_MAX_EMBEDS = int(os.getenv("DISCORD_BATCH_MAX_EMBEDS", "10"))  # Discord allows at most 10
+    
+    # Notification Outbox (undelivered results, retried with backoff)
+    OUTBOX_DB_PATH = os.getenv("OUTBOX_DB_PATH", os.path.join(DATA_DIR, "outbox.db"))
+    OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "5"))
+    OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "300"))
+    OUTBOX_REPLAY_INTERVAL_SECONDS = float(os.getenv("OUTBOX_REPLAY_INTERVAL_SECONDS", "5"))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))  # failed deliveries before a record is marked dead
+    OUTBOX_REPLAY_LIMIT = int(os.getenv("OUTBOX_REPLAY_LIMIT", "200"))  # records handed back per pass
+    OUTBOX_RETENTION_HOURS = int(os.getenv("OUTBOX_RETENTION_HOURS", "24"))  # keep delivered records this long
+    
+    # Circuit Breakers (per notification sink)
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))  # consecutive failures before opening
+    BREAKER_PROBE_INTERVAL_SECONDS = float(os.getenv("BREAKER_PROBE_INTERVAL_SECONDS", "10"))
+    
+    # Health Monitoring (background probes; status reads the cached results)
+    HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "30"))
+    
+    # HTTP Transport (shared keep-alive connection pools)
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))  # hosts to keep pools for
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "4"))  # connections kept per host
+    HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+    HTTP_HOST_LIMITS = os.getenv("HTTP_HOST_LIMITS", "")  # e.g. https://discord.com=2,http://localhost:3001=4
     
     @classmethod
     def create_directories(cls):
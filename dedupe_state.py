@@ -0,0 +1,129 @@
+import os
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from roulette_result import RouletteResult
+from config import Config
+
+class DedupeState:
+    """Persisted per-table memory of emitted results, so restarts don't re-emit the last one"""
+
+    def __init__(self, path: str = None, window_seconds: int = None, max_rounds: int = None,
+                 save_interval: float = None):
+        self.path = path or Config.DEDUPE_STATE_FILE
+        self.window_seconds = window_seconds or Config.DEDUPE_WINDOW_SECONDS
+        self.max_rounds = max_rounds or Config.DEDUPE_MAX_ROUNDS
+        self.save_interval = save_interval or Config.DEDUPE_SAVE_INTERVAL_SECONDS
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._last = {}
+        self._rounds = {}
+        self._round_order = {}
+        self._dirty = False
+        self._load()
+
+        # Tables whose last result came from the state file rather than this run
+        self._restored = set(self._last)
+        self._started = datetime.now()
+
+        # Writes are coalesced on a background thread, so detection never waits on the disk
+        self._stop = threading.Event()
+        self._writer = threading.Thread(target=self._run, name="dedupe-state", daemon=True)
+        self._writer.start()
+
+    def _load(self):
+        """Load the state file; it is bounded, so this is constant-time for a fixed table count"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            self.logger.warning(f"Ignoring unreadable dedupe state {self.path}: {str(e)}")
+            return
+
+        for table_name, table in data.get("tables", {}).items():
+            last = table.get("last")
+            if last:
+                self._last[table_name] = (last["number"], datetime.fromisoformat(last["timestamp"]))
+
+            rounds = deque(table.get("rounds", []), maxlen=self.max_rounds)
+            self._round_order[table_name] = rounds
+            self._rounds[table_name] = set(rounds)
+
+    def _run(self):
+        while not self._stop.wait(self.save_interval):
+            self.save()
+
+    def save(self):
+        """Write the state if anything changed since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return
+            tables = {}
+            for table_name in set(self._last) | set(self._round_order):
+                table = {"rounds": list(self._round_order.get(table_name, ()))}
+                if table_name in self._last:
+                    number, timestamp = self._last[table_name]
+                    table["last"] = {"number": number, "timestamp": timestamp.isoformat()}
+                tables[table_name] = table
+            self._dirty = False
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"tables": tables}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"Error saving dedupe state: {str(e)}")
+
+    def close(self):
+        """Stop the background writer and write any pending state"""
+        self._stop.set()
+        self._writer.join(timeout=5)
+        self.save()
+
+    def is_duplicate(self, result: RouletteResult, round_id: Optional[str] = None) -> bool:
+        """Check a result against what was last emitted for its table"""
+        with self._lock:
+            # A round identifier is authoritative when the page provides one
+            if round_id is not None:
+                return round_id in self._rounds.get(result.table_name, ())
+
+            last = self._last.get(result.table_name)
+            if not last:
+                return False
+
+            number, timestamp = last
+            window = self.window_seconds
+            if result.table_name in self._restored:
+                # The page may still show what the last run emitted: widen the window by the
+                # downtime, so it covers the first window_seconds of this run and no more
+                window += max(0.0, (self._started - timestamp).total_seconds())
+
+            elapsed = (result.timestamp - timestamp).total_seconds()
+            return result.number == number and 0 <= elapsed < window
+
+    def record(self, result: RouletteResult, round_id: Optional[str] = None):
+        """Remember an emitted result; it reaches the state file on the next background save"""
+        with self._lock:
+            self._last[result.table_name] = (result.number, result.timestamp)
+            self._restored.discard(result.table_name)
+
+            if round_id is not None:
+                rounds = self._round_order.setdefault(result.table_name, deque(maxlen=self.max_rounds))
+                seen = self._rounds.setdefault(result.table_name, set())
+                if len(rounds) == rounds.maxlen:
+                    seen.discard(rounds[0])
+                rounds.append(round_id)
+                seen.add(round_id)
+
+            self._dirty = True
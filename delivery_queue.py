@@ -0,0 +1,198 @@
+import time
+import logging
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+from config import Config
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "merge")
+
+class DeliveryQueue:
+    """Bounded queue of outgoing notifications delivered by background worker threads"""
+
+    def __init__(self, name: str, send: Callable[[object], bool], max_size: int = None,
+                 workers: int = None, overflow_policy: str = None,
+                 merge: Optional[Callable[[object, object], Optional[object]]] = None,
+                 coalesce_window_ms: int = 0, coalesce_max: int = 0,
+                 on_drop: Optional[Callable[[object], None]] = None, breaker=None):
+        self.name = name
+        self.send = send
+        self.merge = merge
+        self.on_drop = on_drop
+        self.breaker = breaker
+        self.coalesce_window = coalesce_window_ms / 1000
+        self.coalesce_max = coalesce_max
+        self.max_size = max_size or Config.DELIVERY_QUEUE_SIZE
+        self.overflow_policy = (overflow_policy or Config.DELIVERY_OVERFLOW_POLICY).lower()
+        self.logger = logging.getLogger(__name__)
+
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {self.overflow_policy}")
+
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self.stats = {
+            "queued": 0,
+            "delivered": 0,
+            "failed": 0,
+            "dropped": 0,
+            "merged": 0,
+            "coalesced": 0,
+            "max_depth": 0
+        }
+
+        self._workers = []
+        for i in range(workers or Config.DELIVERY_WORKERS):
+            worker = threading.Thread(target=self._run, name=f"{name}-delivery-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    @property
+    def depth(self) -> int:
+        """Number of items waiting to be delivered"""
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the queue has stopped accepting items"""
+        return self._closed
+
+    def submit(self, item) -> bool:
+        """Queue an item for delivery; never blocks. Returns False if the item was dropped"""
+        with self._condition:
+            if self._closed:
+                return False
+
+            if len(self._items) >= self.max_size:
+                if self._merge_into_tail(item):
+                    return True
+
+                if self.overflow_policy == "drop_newest":
+                    self.stats["dropped"] += 1
+                    self.logger.warning(f"{self.name} queue full, dropping newest notification")
+                    self._dropped(item)
+                    return False
+
+                # drop_oldest, and merge when the item could not be merged
+                self._dropped(self._items.popleft())
+                self.stats["dropped"] += 1
+                self.logger.warning(f"{self.name} queue full, dropping oldest notification")
+
+            self._items.append(item)
+            self.stats["queued"] += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], len(self._items))
+            self._condition.notify()
+            return True
+
+    def _dropped(self, item):
+        if self.on_drop:
+            try:
+                self.on_drop(item)
+            except Exception as e:
+                self.logger.error(f"Error handling dropped {self.name} notification: {str(e)}")
+
+    def _merge_into_tail(self, item) -> bool:
+        """Fold an item into the newest queued one, if the policy and the items allow it"""
+        if self.overflow_policy != "merge" or not self.merge or not self._items:
+            return False
+
+        merged = self.merge(self._items[-1], item)
+        if merged is None:
+            return False
+
+        self._items[-1] = merged
+        self.stats["queued"] += 1
+        self.stats["merged"] += 1
+        return True
+
+    def _run(self):
+        while True:
+            # Hold items while the sink's circuit is open; they stay queued, not dropped
+            if self.breaker and self.breaker.is_open:
+                if self._closed:
+                    return
+                self.breaker.wait_closed(1.0)
+                continue
+
+            with self._condition:
+                while not self._items and not self._closed:
+                    self._condition.wait()
+                if not self._items:
+                    return
+                item = self._items.popleft()
+                self._in_flight += 1
+                if self.coalesce_window and self.merge:
+                    item = self._coalesce(item)
+
+            try:
+                delivered = self.send(item)
+            except Exception as e:
+                self.logger.error(f"Error delivering {self.name} notification: {str(e)}")
+                delivered = False
+
+            with self._condition:
+                self._in_flight -= 1
+                self.stats["delivered" if delivered else "failed"] += 1
+                self._condition.notify_all()
+
+    def _coalesce(self, item):
+        """Merge items arriving within the coalescing window into one delivery; called with the lock held"""
+        deadline = time.monotonic() + self.coalesce_window
+        count = 1
+
+        while not self.coalesce_max or count < self.coalesce_max:
+            while not self._items and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            if not self._items:
+                break
+
+            merged = self.merge(item, self._items[0])
+            if merged is None:
+                break
+
+            item = merged
+            self._items.popleft()
+            self.stats["coalesced"] += 1
+            count += 1
+
+        return item
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Wait until nothing is queued or in flight"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._items and not self._in_flight, timeout)
+
+    def close(self, timeout: float = None):
+        """Stop accepting items, deliver what is queued and stop the workers"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        for worker in self._workers:
+            worker.join(timeout)
+
+        # Anything still queued (held by an open breaker, or left when the join timed out)
+        # goes back to the owner rather than vanishing with the queue
+        with self._condition:
+            leftover = list(self._items)
+            self._items.clear()
+        if leftover:
+            self.logger.info(f"Returning {len(leftover)} undelivered {self.name} notification(s)")
+        for item in leftover:
+            self._dropped(item)
+
+    def get_status(self) -> dict:
+        """Get queue status, including the current depth gauge"""
+        return {
+            "depth": self.depth,
+            "overflow_policy": self.overflow_policy,
+            "paused": bool(self.breaker and self.breaker.is_open),
+            **self.stats
+        }
@@ -0,0 +1,102 @@
+import time
+import logging
+from typing import Iterator, List, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from selector_stats import SelectorStats, MISS
+from config import Config
+
+class DetectionBudget:
+    """One deadline for a whole detection cycle, instead of a wait per selector"""
+
+    def __init__(self, seconds: float = None):
+        self.seconds = Config.DETECTION_BUDGET_SECONDS if seconds is None else seconds
+        self.deadline = time.monotonic() + self.seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def _present(self, driver, selectors: List[str], stats=None) -> Iterator[Tuple[str, object]]:
+        """First element of every selector present right now, looked up lazily; never waits"""
+        for selector in selectors:
+            start = time.monotonic()
+            try:
+                elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            except WebDriverException:
+                elements = []
+            if stats is not None:
+                stats.lookup(selector, time.monotonic() - start)
+            if elements:
+                yield selector, elements[0]
+            elif stats is not None:
+                stats.record(selector, MISS)
+
+    def scan(self, driver, selectors: List[str], stats: Optional[SelectorStats] = None) -> Iterator[Tuple[str, object]]:
+        """Yield (selector, element) in selector order, waiting at most once if nothing is present.
+
+        Lookups happen as the caller iterates, so stopping at the first useful element
+        skips the rest of the list.
+        """
+        found = False
+        for selector, element in self._present(driver, selectors, stats):
+            found = True
+            if not self.remaining():
+                return
+            yield selector, element
+
+        if found or not self.remaining():
+            return
+
+        # A single wait for any of the selectors, bounded by what is left of the budget
+        combined = ", ".join(selectors)
+        try:
+            WebDriverWait(driver, self.remaining(), poll_frequency=0.25).until(
+                lambda d: d.find_elements(By.CSS_SELECTOR, combined)
+            )
+        except TimeoutException:
+            return
+
+        for selector, element in self._present(driver, selectors):
+            if not self.remaining():
+                return
+            yield selector, element
+
+class CycleStats:
+    """Detection cycle durations, so stalls show up in status and logs"""
+
+    def __init__(self, budget: float = None):
+        self.budget = Config.DETECTION_BUDGET_SECONDS if budget is None else budget
+        self.logger = logging.getLogger(__name__)
+        self.cycles = 0
+        self.over_budget = 0
+        self.last_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_seconds = 0.0
+        self.waited_seconds = 0.0
+
+    def record(self, seconds: float, waited: float = 0.0):
+        """Record one cycle; time spent blocked waiting for a pushed result doesn't count against the budget"""
+        seconds = max(0.0, seconds - waited)
+        self.waited_seconds += waited
+        self.cycles += 1
+        self.last_seconds = seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.total_seconds += seconds
+
+        # Allow a little slack for the text reads after the deadline check
+        if seconds > self.budget + 1:
+            self.over_budget += 1
+            self.logger.warning(f"Detection cycle took {seconds:.1f}s (budget {self.budget:.1f}s)")
+
+    def get_status(self) -> dict:
+        return {
+            "cycles": self.cycles,
+            "last_seconds": round(self.last_seconds, 3),
+            "max_seconds": round(self.max_seconds, 3),
+            "avg_seconds": round(self.total_seconds / self.cycles, 3) if self.cycles else 0.0,
+            "over_budget": self.over_budget,
+            "waited_seconds": round(self.waited_seconds, 3)
+        }
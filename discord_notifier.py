@@ -1,40 +1,176 @@
-import requests
 import json
 import logging
+import threading
 from datetime import datetime
 from typing import Optional
-from roulette_result import RouletteResult
+from roulette_result import RouletteResult, get_color_for_number
+from delivery_queue import DeliveryQueue
+from outbox import Outbox, OutboxReplayer
+from result_digest import ResultDigest
+from http_transport import get_session
+from rate_limiter import get_rate_limiter
+from circuit_breaker import CircuitBreaker
+from health_monitor import get_health_monitor
 from config import Config
 
+# Discord accepts at most 10 embeds in one webhook message
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# Everything in a webhook payload after the embeds, serialized once
+PAYLOAD_TAIL = json.dumps({
+    "username": "Roulette Results Collector",
+    "avatar_url": "https://cdn.discordapp.com/attachments/123456789/roulette_icon.png"
+}, separators=(',', ':'))[1:]
+
 class DiscordNotifier:
     """Handles Discord webhook notifications for roulette results"""
     
-    def __init__(self, webhook_url: str = None):
+    # Serialized static part of each pocket's embed, shared by every notifier
+    _result_templates = None
+    
+    def __init__(self, webhook_url: str = None, sink: str = "discord", workers: int = None,
+                 digest_spins: int = None, digest_minutes: float = None):
         self.webhook_url = webhook_url or Config.DISCORD_WEBHOOK_URL
         self.logger = logging.getLogger(__name__)
+        self.rate_limiter = get_rate_limiter()
+        self.sink = sink
+        self.breaker = CircuitBreaker(sink, self._probe)
+        self.health = get_health_monitor()
+        self.health.register(sink, self._probe)
+        self._footers = {}
+        
+        if DiscordNotifier._result_templates is None:
+            DiscordNotifier._result_templates = [self._build_result_template(n) for n in range(37)]
+        
+        # Background delivery, so a slow Discord never stalls detection. With a batch
+        # window, messages arriving close together go out as one multi-embed message
+        self.batch_window_ms = Config.DISCORD_BATCH_WINDOW_MS
+        self.batch_max_embeds = min(max(Config.DISCORD_BATCH_MAX_EMBEDS, 1), MAX_EMBEDS_PER_MESSAGE)
+        self.queue = DeliveryQueue(sink, self._deliver, merge=self._merge_messages,
+                                   coalesce_window_ms=self.batch_window_ms,
+                                   coalesce_max=self.batch_max_embeds,
+                                   workers=workers, on_drop=self._release, breaker=self.breaker)
+        
+        # Results stay in the outbox until Discord accepts them, and are retried from there
+        self.outbox = Outbox(sink)
+        self.replayer = OutboxReplayer(self.outbox, self._submit_replay, self.batch_max_embeds)
+        
+        # Digest mode: one summary every N spins and/or M minutes instead of a message per spin
+        self.digest_spins = Config.DISCORD_DIGEST_SPINS if digest_spins is None else digest_spins
+        self.digest_minutes = Config.DISCORD_DIGEST_MINUTES if digest_minutes is None else digest_minutes
+        self.digest = ResultDigest() if self.digest_spins or self.digest_minutes else None
+        self._digest_stop = threading.Event()
+        if self.digest and self.digest_minutes:
+            threading.Thread(target=self._run_digest_timer, name=f"{sink}-digest", daemon=True).start()
         
     def send_result(self, result: RouletteResult) -> bool:
         """Send a roulette result to Discord"""
+        if self._send_message([self._render_result_embed(result)]):
+            self.logger.info(f"Result sent to Discord: {result.number} ({result.color})")
+            return True
+        return False
+    
+    def enqueue_result(self, result: RouletteResult) -> bool:
+        """Queue a roulette result for background delivery to Discord"""
+        if self.digest:
+            self.digest.add(result)
+            if self.digest_spins and self.digest.count >= self.digest_spins:
+                return self.enqueue_digest()
+            return True
+        
+        # The outbox insert happens on the delivery worker, batched with whatever it coalesces
+        if self.queue.submit(([self._render_result_embed(result)], [], [result])):
+            return True
+        if self.queue.closed:
+            self.outbox.add_many([result], "pending")
+        return False
+    
+    def enqueue_status_message(self, message: str, color: int = 0x00ff00) -> bool:
+        """Queue a status message for background delivery to Discord"""
+        return self.queue.submit(([json.dumps(self._create_status_embed(message, color))], [], []))
+    
+    def enqueue_digest(self) -> bool:
+        """Queue the summary of results since the last digest, if there were any"""
+        embed = self.digest.take_embed()
+        if embed is None:
+            return True
+        return self.queue.submit(([json.dumps(embed)], [], []))
+    
+    def _run_digest_timer(self):
+        while not self._digest_stop.wait(self.digest_minutes * 60):
+            self.enqueue_digest()
+    
+    def _merge_messages(self, pending: tuple, new: tuple):
+        """Fold the embeds of a new message into a queued one, within Discord's per-message limit"""
+        if len(pending[0]) + len(new[0]) > self.batch_max_embeds:
+            return None
+        return pending[0] + new[0], pending[1] + new[1], pending[2] + new[2]
+    
+    def _deliver(self, message: tuple) -> bool:
+        """Send a queued message and record the outcome in the outbox"""
+        embeds, record_ids, unsaved = message
+        record_ids = record_ids + self.outbox.add_many(unsaved)
+        if self._send_message(embeds):
+            self.outbox.mark_delivered(record_ids)
+            return True
+        self.outbox.mark_failed(record_ids, "Discord delivery failed")
+        return False
+    
+    def _release(self, message: tuple):
+        """Return a message dropped from the queue to the outbox"""
+        self.outbox.release(message[1])
+        self.outbox.add_many(message[2], "pending")
+    
+    def _submit_replay(self, records: list) -> bool:
+        """Queue a batch of outbox records as one message, unless live traffic is backed up"""
+        if self.breaker.is_open or self.queue.depth >= self.queue.max_size // 2:
+            return False
+        embeds = [self._render_result_embed(result) for _, result in records]
+        return self.queue.submit((embeds, [record_id for record_id, _ in records], []))
+    
+    def _send_message(self, embeds: list) -> bool:
+        """Post a message through the circuit breaker; fails fast while Discord is down"""
+        if not self.breaker.allow():
+            return False
+        
+        if self._post_message(embeds):
+            self.breaker.record_success()
+            return True
+        self.breaker.record_failure()
+        return False
+    
+    def _probe(self) -> bool:
+        """Check the webhook is reachable without posting to it"""
+        return get_session().get(self.webhook_url, timeout=5).status_code == 200
+    
+    def _post_message(self, embeds: list) -> bool:
+        """Post one webhook message carrying the given serialized embeds, waiting out rate limits"""
         try:
-            embed = self._create_result_embed(result)
-            payload = {
-                "embeds": [embed],
-                "username": "Roulette Results Collector",
-                "avatar_url": "https://cdn.discordapp.com/attachments/123456789/roulette_icon.png"
-            }
+            body = ('{"embeds":[' + ",".join(embeds) + "]," + PAYLOAD_TAIL).encode("utf-8")
             
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
+            for attempt in range(Config.DISCORD_MAX_RETRIES + 1):
+                self.rate_limiter.acquire(self.webhook_url)
+                
+                response = get_session().post(
+                    self.webhook_url,
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=10
+                )
+                self.rate_limiter.update(self.webhook_url, response.headers)
+                
+                if response.status_code == 204:
+                    return True
+                elif response.status_code == 429:
+                    # The next acquire() waits out retry_after
+                    self.rate_limiter.rate_limited(self.webhook_url, response)
+                    continue
+                else:
+                    self.logger.error(f"Failed to send to Discord: {response.status_code} - {response.text}")
+                    return False
             
-            if response.status_code == 204:
-                self.logger.info(f"Result sent to Discord: {result.number} ({result.color})")
-                return True
-            else:
-                self.logger.error(f"Failed to send to Discord: {response.status_code} - {response.text}")
-                return False
+            self.logger.error(f"Failed to send to Discord: still rate limited after {Config.DISCORD_MAX_RETRIES} retries")
+            return False
                 
         except Exception as e:
             self.logger.error(f"Error sending to Discord: {str(e)}")
@@ -42,30 +178,41 @@ class DiscordNotifier:
     
     def send_status_message(self, message: str, color: int = 0x00ff00) -> bool:
         """Send a status message to Discord"""
-        try:
-            embed = {
-                "title": "Roulette Collector Status",
-                "description": message,
-                "color": color,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            payload = {
-                "embeds": [embed],
-                "username": "Roulette Results Collector"
-            }
-            
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
-            
-            return response.status_code == 204
-            
-        except Exception as e:
-            self.logger.error(f"Error sending status to Discord: {str(e)}")
-            return False
+        # When batching, status messages share a request with nearby results
+        if self.batch_window_ms and not self.queue.closed:
+            return self.enqueue_status_message(message, color)
+        return self._send_message([json.dumps(self._create_status_embed(message, color))])
+    
+    def _create_status_embed(self, message: str, color: int) -> dict:
+        """Create Discord embed for a status message"""
+        return {
+            "title": "Roulette Collector Status",
+            "description": message,
+            "color": color,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    def _build_result_template(self, number: int) -> str:
+        """Serialize a pocket's embed without its footer and timestamp, left open for them"""
+        embed = self._create_result_embed(RouletteResult(
+            number=number,
+            color=get_color_for_number(number),
+            timestamp=datetime.min,
+            table_name=""
+        ))
+        del embed["footer"], embed["timestamp"]
+        return json.dumps(embed, separators=(',', ':'))[:-1]
+    
+    def _render_result_embed(self, result: RouletteResult) -> str:
+        """Serialized result embed: the pocket template plus the table footer and timestamp"""
+        if not 0 <= result.number <= 36 or result.color != get_color_for_number(result.number):
+            return json.dumps(self._create_result_embed(result))
+        
+        footer = self._footers.get(result.table_name)
+        if footer is None:
+            footer = self._footers[result.table_name] = ',"footer":' + json.dumps({"text": f"Table: {result.table_name}"})
+        
+        return f'{self._result_templates[result.number]}{footer},"timestamp":"{result.timestamp.isoformat()}"}}'
     
     def _create_result_embed(self, result: RouletteResult) -> dict:
         """Create Discord embed for roulette result"""
@@ -144,3 +291,26 @@ class DiscordNotifier:
         """Send shutdown notification to Discord"""
         message = "🛑 Roulette Results Collector stopped."
         return self.send_status_message(message, color=0xffa500)
+    
+    def get_status(self) -> dict:
+        """Get Discord delivery status"""
+        return {
+            "webhook_configured": bool(self.webhook_url),
+            "queue": self.queue.get_status(),
+            "rate_limit": self.rate_limiter.get_status(),
+            "breaker": self.breaker.get_status(),
+            "health": self.health.get(self.sink),
+            "outbox": {**self.outbox.counts(), "replayed": self.replayer.replayed},
+            "digest": {"pending_spins": self.digest.count} if self.digest else None
+        }
+    
+    def close(self, timeout: float = 15):
+        """Deliver queued messages and stop the delivery workers"""
+        self.health.unregister(self.sink)
+        if self.digest:
+            self._digest_stop.set()
+            self.enqueue_digest()
+        self.replayer.stop()
+        self.queue.close(timeout)
+        self.breaker.stop()
+        self.outbox.close()
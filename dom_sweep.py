@@ -0,0 +1,61 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Runs every selector in the page and returns [selector, text, data-*] for each visible match,
+# so a whole detection pass costs one WebDriver round trip
+SWEEP_SCRIPT = """
+const selectors = arguments[0];
+const matches = [];
+for (const selector of selectors) {
+    let elements;
+    try {
+        elements = document.querySelectorAll(selector);
+    } catch (e) {
+        continue;
+    }
+    for (const element of elements) {
+        if (!element.getClientRects().length) {
+            continue;
+        }
+        const text = (element.innerText || '').trim();
+        const data = Object.assign({}, element.dataset);
+        if (!data.roundId) {
+            const round = element.closest('[data-round-id],[data-game-id]');
+            if (round) {
+                data.roundId = round.dataset.roundId || round.dataset.gameId;
+            }
+        }
+        if (text.length > 16 && !Object.keys(data).length) {
+            continue;
+        }
+        matches.push([selector, text.slice(0, 16), data]);
+    }
+}
+return matches;
+"""
+
+# data-* attributes (as dataset keys) that may carry the winning number
+NUMBER_ATTRIBUTES = ("result", "number", "winningNumber", "rouletteResult", "gameResult")
+
+def sweep_selectors(driver, selectors: Iterable[str]) -> List[Tuple[str, str, dict]]:
+    """Query all selectors in one execute_script call"""
+    return driver.execute_script(SWEEP_SCRIPT, list(selectors)) or []
+
+def _parse_number(value) -> Optional[int]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value.isdigit() and 0 <= int(value) <= 36:
+        return int(value)
+    return None
+
+def iter_candidates(matches: List[Tuple[str, str, dict]]) -> Iterator[Tuple[str, int, Optional[str]]]:
+    """Yield (selector, number, round_id) for matches holding a roulette number, in selector order"""
+    for selector, text, data in matches:
+        number = _parse_number(text)
+        if number is None:
+            for attribute in NUMBER_ATTRIBUTES:
+                number = _parse_number(data.get(attribute))
+                if number is not None:
+                    break
+        if number is not None:
+            yield selector, number, data.get("roundId")
@@ -0,0 +1,203 @@
+import json
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Iterable, Optional
+
+from roulette_result import RouletteResult
+from spin_log import to_epoch_ms
+from config import Config
+
+# Events a slow subscriber may fall behind by before it is disconnected
+CLIENT_BUFFER_SIZE = 256
+HEARTBEAT_SECONDS = 15
+
+class ResultFeedServer:
+    """Server-Sent Events feed that pushes results to local dashboards over one connection each"""
+
+    def __init__(self, host: str = None, port: int = None, replay_size: int = None):
+        self.host = host or Config.FEED_HOST
+        self.port = port or Config.FEED_PORT
+        self.enabled = Config.ENABLE_LOCAL_FEED
+        self.logger = logging.getLogger(__name__)
+
+        self._history = deque(maxlen=replay_size or Config.FEED_REPLAY_SIZE)
+        self._last_id = 0
+        self._clients = set()
+        # Created up front so results published before start() queue on it; only the loop touches the history
+        self._loop = asyncio.new_event_loop() if self.enabled else None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self.stats = {
+            "published": 0,
+            "connections": 0,
+            "disconnected_slow": 0
+        }
+
+    def start(self) -> bool:
+        """Start serving on a background event loop"""
+        if not self.enabled:
+            return False
+
+        self._thread = threading.Thread(target=self._run, name="result-feed", daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        return self._server is not None
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port)
+            )
+            self.logger.info(f"Result feed listening on http://{self.host}:{self.port}/events")
+        except OSError as e:
+            self.logger.error(f"Could not start result feed on {self.host}:{self.port}: {str(e)}")
+            self._loop.close()
+            self._ready.set()
+            return
+
+        self._ready.set()
+        self._loop.run_forever()
+
+        # Stopped: end subscriber streams before closing the loop
+        tasks = asyncio.all_tasks(self._loop)
+        for task in tasks:
+            task.cancel()
+        self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self._server.close()
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def _call_on_loop(self, callback, *args):
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The feed failed to start or has been stopped
+            pass
+
+    def preload(self, results: Iterable[RouletteResult]):
+        """Seed the replay buffer, e.g. from the warm-start history"""
+        self._call_on_loop(self._preload, list(results))
+
+    def _preload(self, results: list):
+        for result in results:
+            self._remember(result)
+
+    def _remember(self, result: RouletteResult) -> tuple:
+        # Ids are the result's epoch milliseconds, so a client's Last-Event-ID still means
+        # something after a restart; bumped when needed to keep them strictly increasing
+        self._last_id = max(to_epoch_ms(result.timestamp), self._last_id + 1)
+        event = (self._last_id, json.dumps(result.to_dict()))
+        self._history.append(event)
+        return event
+
+    def publish(self, result: RouletteResult):
+        """Push a result to every subscriber; safe to call from any thread"""
+        self._call_on_loop(self._broadcast, result)
+
+    def _broadcast(self, result: RouletteResult):
+        event = self._remember(result)
+        self.stats["published"] += 1
+        for queue in list(self._clients):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Drop the subscriber rather than buffer without bound; it can reconnect and replay
+                self.stats["disconnected_slow"] += 1
+                self._clients.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            path = request_line[1].split("?")[0] if len(request_line) > 1 else "/"
+            if path == "/events":
+                await self._stream(writer, headers.get("last-event-id"))
+            elif path == "/recent":
+                body = "[" + ",".join(data for _, data in self._history) + "]"
+                await self._respond(writer, "200 OK", "application/json", body)
+            elif path == "/health":
+                await self._respond(writer, "200 OK", "application/json",
+                                    json.dumps({"clients": len(self._clients), **self.stats}))
+            else:
+                await self._respond(writer, "404 Not Found", "text/plain", "Not found")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutting down; the connection is closed below
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, content_type: str, body: str):
+        data = body.encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(data)}\r\n"
+            f"Access-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n".encode("latin-1") + data
+        )
+        await writer.drain()
+
+    async def _stream(self, writer: asyncio.StreamWriter, last_event_id: Optional[str]):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+            b"Access-Control-Allow-Origin: *\r\nConnection: keep-alive\r\n\r\n"
+        )
+
+        # Subscribe before the first await, so results broadcast while the replay drains are queued
+        queue = asyncio.Queue(CLIENT_BUFFER_SIZE)
+        self._clients.add(queue)
+        self.stats["connections"] += 1
+        try:
+            # Replay what the subscriber missed: everything after Last-Event-ID, or the recent history
+            after = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+            for event_id, data in self._history:
+                if event_id > after:
+                    writer.write(f"id: {event_id}\nevent: result\ndata: {data}\n\n".encode("utf-8"))
+            await writer.drain()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                    await writer.drain()
+                    continue
+
+                if event is None:
+                    return
+                event_id, data = event
+                writer.write(f"id: {event_id}\nevent: result\ndata: {data}\n\n".encode("utf-8"))
+                await writer.drain()
+        finally:
+            self._clients.discard(queue)
+
+    def stop(self):
+        """Close subscriber connections and stop the server"""
+        if self._loop is None or not self._loop.is_running():
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def get_status(self) -> dict:
+        """Get feed status"""
+        return {
+            "enabled": self.enabled,
+            "url": f"http://{self.host}:{self.port}/events" if self._server else None,
+            "clients": len(self._clients),
+            **self.stats
+        }
@@ -0,0 +1,103 @@
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+from http_transport import get_session
+from config import Config
+
+class HealthMonitor:
+    """Runs health probes on a schedule and caches the latest outcome of each"""
+
+    def __init__(self, interval: float = None):
+        self.interval = interval or Config.HEALTH_PROBE_INTERVAL_SECONDS
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._results = {}
+        self._probes = {}
+        self._stop = threading.Event()
+
+    def register(self, name: str, probe: Callable[[], bool], interval: float = None):
+        """Start probing on a background thread; the first probe runs right away"""
+        with self._lock:
+            if name in self._probes:
+                return
+            self._probes[name] = probe
+            self._results[name] = {"healthy": None, "latency_ms": None, "checked_at": None, "error": None}
+
+        thread = threading.Thread(target=self._run, args=(name, probe, interval or self.interval),
+                                  name=f"health-{name}", daemon=True)
+        thread.start()
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._probes.pop(name, None)
+            self._results.pop(name, None)
+
+    def _run(self, name: str, probe: Callable[[], bool], interval: float):
+        while not self._stop.is_set():
+            with self._lock:
+                if self._probes.get(name) is not probe:
+                    return
+            self._check(name, probe)
+            self._stop.wait(interval)
+
+    def _check(self, name: str, probe: Callable[[], bool]):
+        start = time.monotonic()
+        error = None
+        try:
+            healthy = bool(probe())
+        except Exception as e:
+            healthy = False
+            error = str(e)
+
+        result = {
+            "healthy": healthy,
+            "latency_ms": round((time.monotonic() - start) * 1000, 1),
+            "checked_at": datetime.now().isoformat(),
+            "error": error
+        }
+
+        with self._lock:
+            previous = self._results.get(name)
+            if name not in self._probes:
+                return
+            self._results[name] = result
+
+        if previous and previous["healthy"] is not None and previous["healthy"] != healthy:
+            if healthy:
+                self.logger.info(f"{name} is healthy again")
+            else:
+                self.logger.warning(f"{name} health check failed{': ' + error if error else ''}")
+
+    def get(self, name: str) -> Optional[dict]:
+        """Cached outcome of a probe; never blocks on the network"""
+        with self._lock:
+            result = self._results.get(name)
+            return dict(result) if result else None
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {name: dict(result) for name, result in self._results.items()}
+
+    def stop(self):
+        self._stop.set()
+
+def probe_webdriver(driver) -> bool:
+    """Ask chromedriver for the session's URL over HTTP with a timeout, so a wedged browser can't hang us"""
+    if driver is None:
+        return False
+    url = f"{driver.service.service_url}/session/{driver.session_id}/url"
+    return get_session().get(url, timeout=5).status_code == 200
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+def get_health_monitor() -> HealthMonitor:
+    """Get the process-wide health monitor"""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = HealthMonitor()
+        return _monitor
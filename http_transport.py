@@ -0,0 +1,55 @@
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+_session = None
+_lock = threading.Lock()
+
+def parse_host_limits(spec: str) -> dict:
+    """Parse "https://discord.com=4,http://localhost:3001=2" into {prefix: limit}"""
+    limits = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        prefix, _, limit = entry.rpartition("=")
+        limits[prefix.rstrip("/") + "/"] = int(limit)
+    return limits
+
+def _create_session() -> requests.Session:
+    """Build a session whose connection pools keep connections (and TLS sessions) alive"""
+    session = requests.Session()
+
+    default_adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+        pool_block=Config.HTTP_POOL_BLOCK
+    )
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+
+    # Hosts with their own connection cap; requests picks the longest matching prefix
+    for prefix, limit in parse_host_limits(Config.HTTP_HOST_LIMITS).items():
+        session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=limit, pool_block=True))
+
+    return session
+
+def get_session() -> requests.Session:
+    """Get the shared HTTP session used by every client in the process"""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = _create_session()
+            logging.getLogger(__name__).debug("Created shared HTTP session")
+        return _session
+
+def close_session():
+    """Close the shared session and its pooled connections"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
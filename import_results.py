@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Streaming bulk importer for legacy results_YYYYMMDD.json files
+Parses each JSON array incrementally and loads it into the configured result store
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator
+
+from roulette_result import RouletteResult, get_color_for_number
+from result_store import ResultStore
+from result_journal import ResultJournal
+from spin_log import SpinLogWriter
+from config import Config
+
+_WHITESPACE = re.compile(r"\s*")
+
+def iter_json_array(path: str, chunk_size: int = 1 << 20) -> Iterator[dict]:
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        pos = 0
+        started = False
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = not chunk
+            return bool(chunk)
+
+        fill()
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                if fill():
+                    continue
+                raise ValueError(f"Unexpected end of file in {path}")
+
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array in {path}")
+                started = True
+                pos += 1
+            elif char == "]":
+                return
+            elif char == ",":
+                pos += 1
+            else:
+                try:
+                    element, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # The element runs past the buffer; read more and retry
+                    if eof or not fill():
+                        raise
+                    continue
+
+                # A number cut by the chunk boundary still decodes ("45" of 456, "1" of 1e3),
+                # so only accept an element once the delimiter after it is in the buffer
+                after = _WHITESPACE.match(buffer, end).end()
+                if after == len(buffer) or buffer[after] not in ",]":
+                    if not eof and fill():
+                        continue
+                    if after < len(buffer):
+                        raise ValueError(f"Expected ',' or ']' at offset {after} in {path}")
+
+                pos = end
+                yield element
+
+def validate_entry(entry: dict) -> RouletteResult:
+    """Build a result from a legacy entry, rejecting impossible numbers and colors"""
+    result = RouletteResult.from_dict(entry)
+
+    if not isinstance(result.number, int) or not 0 <= result.number <= 36:
+        raise ValueError(f"Invalid number: {result.number}")
+    if result.color != get_color_for_number(result.number):
+        raise ValueError(f"Color {result.color} does not match number {result.number}")
+
+    return result
+
+def import_file(path: str, db_path: str, batch_size: int) -> dict:
+    """Import one legacy file; resumes where a previous run of the same file stopped"""
+    store = ResultStore(db_path)
+    source = os.path.basename(path)
+    stats = {"file": source, "imported": 0, "invalid": 0, "skipped": False}
+
+    try:
+        position, complete = store.import_progress(source)
+        if complete:
+            stats["skipped"] = True
+            return stats
+
+        batch = []
+        index = 0
+        for index, entry in enumerate(iter_json_array(path), 1):
+            if index <= position:
+                continue
+
+            try:
+                batch.append(validate_entry(entry))
+            except (KeyError, TypeError, ValueError):
+                stats["invalid"] += 1
+                continue
+
+            if len(batch) >= batch_size:
+                store.import_batch(source, batch, index)
+                stats["imported"] += len(batch)
+                batch = []
+
+        store.import_batch(source, batch, max(index, position), complete=True)
+        stats["imported"] += len(batch)
+        return stats
+
+    finally:
+        store.close()
+
+def _load_progress(path: str) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def _save_progress(path: str, progress: dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(progress, f)
+    os.replace(tmp_path, path)
+
+def import_file_to_day_store(path: str, store, progress_path: str, batch_size: int) -> dict:
+    """Import one legacy file into a day-file backend (jsonl or binary), resuming from saved progress.
+
+    Once complete the legacy file is renamed to *.json.imported, so readers that also
+    scan legacy day files don't see its results twice.
+    """
+    source = os.path.basename(path)
+    stats = {"file": source, "imported": 0, "invalid": 0, "skipped": False}
+
+    progress = _load_progress(progress_path)
+    position = progress.get(source, 0)
+
+    def commit(batch: list, index: int):
+        store.append_many(batch)
+        store.sync()
+        progress[source] = index
+        _save_progress(progress_path, progress)
+        stats["imported"] += len(batch)
+
+    batch = []
+    index = 0
+    for index, entry in enumerate(iter_json_array(path), 1):
+        if index <= position:
+            continue
+
+        try:
+            batch.append(validate_entry(entry))
+        except (KeyError, TypeError, ValueError):
+            stats["invalid"] += 1
+            continue
+
+        if len(batch) >= batch_size:
+            commit(batch, index)
+            batch = []
+
+    commit(batch, max(index, position))
+    os.replace(path, path + ".imported")
+
+    progress.pop(source, None)
+    _save_progress(progress_path, progress)
+    return stats
+
+def _import_into_day_files(files: list, backend: str, data_dir: str, batch_size: int) -> list:
+    """Import sequentially: day files are shared between legacy files and aren't safe for concurrent writers"""
+    logger = logging.getLogger(__name__)
+    store = ResultJournal(data_dir) if backend == "jsonl" else SpinLogWriter(data_dir)
+    progress_path = os.path.join(data_dir, "import_progress.json")
+
+    all_stats = []
+    try:
+        for path in files:
+            try:
+                stats = import_file_to_day_store(path, store, progress_path, batch_size)
+                all_stats.append(stats)
+                logger.info(f"{stats['file']}: {stats['imported']} imported, {stats['invalid']} invalid")
+            except Exception as e:
+                logger.error(f"Failed to import {path}: {str(e)}")
+    finally:
+        store.close()
+
+    return all_stats
+
+def import_legacy_results(data_dir: str = None, db_path: str = None, workers: int = None,
+                          batch_size: int = 5000, backend: str = None) -> list:
+    """Import every legacy results_*.json file into the configured result store backend"""
+    logger = logging.getLogger(__name__)
+    data_dir = data_dir or Config.DATA_DIR
+    db_path = db_path or Config.RESULT_DB_PATH
+    backend = (backend or Config.RESULT_STORE_BACKEND).lower()
+
+    files = sorted(glob.glob(os.path.join(data_dir, "results_*.json")))
+    if not files:
+        logger.info(f"No legacy result files found in {data_dir}")
+        return []
+
+    if backend in ("jsonl", "binary"):
+        return _import_into_day_files(files, backend, data_dir, batch_size)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown result store backend: {backend}")
+
+    # SQLite tracks progress per file in the database, so files can load in parallel
+
+    # Create the schema once before workers race to do it
+    ResultStore(db_path).close()
+
+    all_stats = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(import_file, path, db_path, batch_size): path for path in files}
+
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                stats = future.result()
+                all_stats.append(stats)
+                if stats["skipped"]:
+                    logger.info(f"{stats['file']}: already imported")
+                else:
+                    logger.info(f"{stats['file']}: {stats['imported']} imported, {stats['invalid']} invalid")
+            except Exception as e:
+                logger.error(f"Failed to import {path}: {str(e)}")
+
+    return all_stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Import legacy results_*.json files into the result store")
+    parser.add_argument("--data-dir", default=Config.DATA_DIR, help="directory holding results_*.json files")
+    parser.add_argument("--backend", default=Config.RESULT_STORE_BACKEND, choices=["jsonl", "sqlite", "binary"],
+                        help="result store to load into (default: RESULT_STORE_BACKEND)")
+    parser.add_argument("--db", default=Config.RESULT_DB_PATH, help="SQLite result store to load into")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for the sqlite backend (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="results per insert transaction")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL),
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler(sys.stdout)])
+
+    start = time.time()
+    stats = import_legacy_results(args.data_dir, args.db, args.workers, args.batch_size, args.backend)
+
+    imported = sum(s["imported"] for s in stats)
+    invalid = sum(s["invalid"] for s in stats)
+    print(f"Imported {imported} results from {len(stats)} file(s) in {time.time() - start:.1f}s ({invalid} invalid)")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,11 @@ import json
 import logging
 from typing import Optional
 from roulette_result import RouletteResult
+from delivery_queue import DeliveryQueue
+from outbox import Outbox, OutboxReplayer
+from circuit_breaker import CircuitBreaker
+from health_monitor import get_health_monitor
+from http_transport import get_session
 from config import Config
 
 class LocalHTMLClient:
@@ -12,7 +17,96 @@ class LocalHTMLClient:
         self.endpoint = endpoint or Config.LOCAL_HTML_ENDPOINT
         self.logger = logging.getLogger(__name__)
         self.enabled = Config.ENABLE_LOCAL_HTML
+        self.queue = None
+        self.outbox = None
+        self.replayer = None
+        self.breaker = CircuitBreaker("local_html", self._probe)
+        self.health = get_health_monitor()
         
+        if self.enabled:
+            # Background delivery backed by the outbox, so results survive an outage
+            self.queue = DeliveryQueue("local_html", self._deliver, merge=self._merge_batches,
+                                       on_drop=self._release, breaker=self.breaker)
+            self.outbox = Outbox("local_html")
+            self.replayer = OutboxReplayer(self.outbox, self._submit_replay, Config.LOCAL_HTML_BATCH_SIZE)
+            self.health.register("local_html", self._probe)
+        
+    def enqueue_result(self, result: RouletteResult) -> bool:
+        """Queue a result for background delivery to the local HTML system"""
+        if not self.enabled:
+            return True
+        
+        # The outbox insert happens on the delivery worker, batched with whatever it coalesces
+        if self.queue.submit(([result], [], [result])):
+            return True
+        if self.queue.closed:
+            self.outbox.add_many([result], "pending")
+        return False
+    
+    def _merge_batches(self, pending: tuple, new: tuple):
+        """Fold a new result into a queued batch, up to the batch size"""
+        if len(pending[0]) + len(new[0]) > Config.LOCAL_HTML_BATCH_SIZE:
+            return None
+        return pending[0] + new[0], pending[1] + new[1], pending[2] + new[2]
+    
+    def _deliver(self, batch: tuple) -> bool:
+        """Post a queued batch and record the outcome in the outbox"""
+        results, record_ids, unsaved = batch
+        record_ids = record_ids + self.outbox.add_many(unsaved)
+        if not self.breaker.allow():
+            self.outbox.mark_failed(record_ids, "Circuit open")
+            return False
+        
+        try:
+            if len(results) == 1:
+                delivered = self._post(self.endpoint, results[0].to_dict(), timeout=5)
+            else:
+                delivered = self._post(f"{self.endpoint}/batch", {
+                    "results": [result.to_dict() for result in results],
+                    "count": len(results)
+                }, timeout=10)
+            error = None if delivered else "Local HTML rejected the results"
+        except requests.exceptions.RequestException as e:
+            delivered = False
+            error = str(e)
+        
+        if delivered:
+            self.breaker.record_success()
+            self.outbox.mark_delivered(record_ids)
+        else:
+            self.breaker.record_failure()
+            self.outbox.mark_failed(record_ids, error)
+        return delivered
+    
+    def _release(self, batch: tuple):
+        """Return a batch dropped from the queue to the outbox"""
+        self.outbox.release(batch[1])
+        self.outbox.add_many(batch[2], "pending")
+    
+    def _submit_replay(self, records: list) -> bool:
+        """Queue a batch of outbox records, unless live traffic is backed up"""
+        if self.breaker.is_open or self.queue.depth >= self.queue.max_size // 2:
+            return False
+        return self.queue.submit(([result for _, result in records], [record_id for record_id, _ in records], []))
+    
+    def _probe(self) -> bool:
+        """Healthy only when the health endpoint answers 2xx; a 404 or 401 is not a working sink"""
+        return 200 <= get_session().get(f"{self.endpoint}/health", timeout=5).status_code < 300
+    
+    def _post(self, url: str, payload: dict, timeout: float) -> bool:
+        """POST a JSON payload; connection errors propagate to the caller"""
+        response = get_session().post(
+            url,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=timeout
+        )
+        
+        if response.status_code in [200, 201, 204]:
+            return True
+        self.logger.warning(f"Local HTML returned {response.status_code}: {response.text}")
+        return False
+    
     def send_result(self, result: RouletteResult) -> bool:
         """Send result to local HTML system"""
         if not self.enabled:
@@ -21,7 +115,7 @@ class LocalHTMLClient:
         try:
             payload = result.to_dict()
             
-            response = requests.post(
+            response = get_session().post(
                 self.endpoint,
                 json=payload,
                 headers={"Content-Type": "application/json"},
@@ -36,8 +130,8 @@ class LocalHTMLClient:
                 return False
                 
         except requests.exceptions.ConnectionError:
-            self.logger.warning("Local HTML system not available - continuing without local integration")
-            return True
+            self.logger.warning("Local HTML system not available")
+            return False
         except Exception as e:
             self.logger.error(f"Error sending to local HTML: {str(e)}")
             return False
@@ -53,7 +147,7 @@ class LocalHTMLClient:
                 "count": len(results)
             }
             
-            response = requests.post(
+            response = get_session().post(
                 f"{self.endpoint}/batch",
                 json=payload,
                 headers={"Content-Type": "application/json"},
@@ -69,7 +163,7 @@ class LocalHTMLClient:
                 
         except requests.exceptions.ConnectionError:
             self.logger.warning("Local HTML system not available for batch send")
-            return True
+            return False
         except Exception as e:
             self.logger.error(f"Error sending batch to local HTML: {str(e)}")
             return False
@@ -80,7 +174,7 @@ class LocalHTMLClient:
             return True
             
         try:
-            response = requests.get(
+            response = get_session().get(
                 f"{self.endpoint}/health",
                 timeout=5
             )
@@ -100,9 +194,25 @@ class LocalHTMLClient:
             return False
     
     def get_status(self) -> dict:
-        """Get status information about local HTML integration"""
+        """Get status information about local HTML integration, from the cached health probe"""
+        health = self.health.get("local_html")
         return {
             "enabled": self.enabled,
             "endpoint": self.endpoint,
-            "available": self.test_connection() if self.enabled else False
+            # A disabled sink is a no-op that accepts everything, as test_connection() reports
+            "available": bool(health and health["healthy"]) if self.enabled else True,
+            "health": health,
+            "queue": self.queue.get_status() if self.queue else None,
+            "outbox": {**self.outbox.counts(), "replayed": self.replayer.replayed} if self.outbox else None,
+            "breaker": self.breaker.get_status()
         }
+    
+    def close(self, timeout: float = 15):
+        """Deliver queued results and stop the delivery workers"""
+        if not self.enabled:
+            return
+        self.health.unregister("local_html")
+        self.replayer.stop()
+        self.queue.close(timeout)
+        self.breaker.stop()
+        self.outbox.close()
@@ -8,14 +8,16 @@ import time
 import logging
 import signal
 import sys
-import json
 from datetime import datetime
 from typing import Optional
 
 from config import Config
 from browser_connector import BrowserConnector
-from discord_notifier import DiscordNotifier
+from notification_router import NotificationRouter
 from local_html_client import LocalHTMLClient
+from feed_server import ResultFeedServer
+from health_monitor import get_health_monitor, probe_webdriver
+from result_store import create_result_store
 from roulette_result import RouletteResult
 
 class RouletteCollectorWorking:
@@ -23,14 +25,17 @@ class RouletteCollectorWorking:
     
     def __init__(self):
         self.connector = BrowserConnector()
-        self.discord = DiscordNotifier()
+        self.discord = NotificationRouter()
         self.local_html = LocalHTMLClient()
+        self.feed = ResultFeedServer()
+        self.health = get_health_monitor()
+        self.store = create_result_store()
         self.logger = self._setup_logging()
         self.running = False
         self.stats = {
             "results_collected": 0,
-            "discord_sent": 0,
-            "local_html_sent": 0,
+            "discord_queued": 0,
+            "local_html_queued": 0,
             "errors": 0,
             "start_time": None
         }
@@ -64,11 +69,20 @@ class RouletteCollectorWorking:
             # Create necessary directories
             Config.create_directories()
             
+            # Warm the result history from storage
+            self._warm_start()
+            
+            # Serve the local result feed
+            self.feed.start()
+            
             # Connect to existing browser
             if not self.connector.connect_to_existing_browser():
                 self.logger.error("Failed to connect to browser")
                 return False
             
+            # Probe the browser session in the background
+            self.health.register("browser", lambda: probe_webdriver(self.connector.driver))
+            
             # Send startup notification
             self.discord.send_startup_message()
             
@@ -90,6 +104,16 @@ class RouletteCollectorWorking:
             self.logger.error(f"Failed to start collector: {str(e)}")
             return False
     
+    def _warm_start(self):
+        """Pre-fill the connector's result history from persistent storage"""
+        try:
+            recent = self.store.recent(Config.TABLE_NAME, Config.RESULT_HISTORY_SIZE)
+            self.connector.preload_history(recent)
+            self.feed.preload(recent)
+            self.logger.info(f"Loaded {len(recent)} recent results from storage")
+        except Exception as e:
+            self.logger.warning(f"Could not load recent results: {str(e)}")
+    
     def run(self):
         """Main run loop"""
         if not self.start():
@@ -98,7 +122,10 @@ class RouletteCollectorWorking:
         try:
             while self.running:
                 self._process_cycle()
-                time.sleep(Config.SCAN_INTERVAL_SECONDS)
+                # A push-mode cycle that blocked in the page has already paced the loop;
+                # anything else (polling, or a push poll that failed fast) sleeps as usual
+                if not self.connector.push_wait:
+                    time.sleep(Config.SCAN_INTERVAL_SECONDS)
                 
         except KeyboardInterrupt:
             self.logger.info("Keyboard interrupt received")
@@ -136,20 +163,20 @@ class RouletteCollectorWorking:
             # Update connector history
             self.connector.update_result_history(result)
             
-            # Send to Discord
-            if self.discord.send_result(result):
-                self.stats["discord_sent"] += 1
-                self.logger.info("Result sent to Discord successfully")
+            # Queue for Discord; delivery happens on background workers
+            if self.discord.enqueue_result(result):
+                self.stats["discord_queued"] += 1
             else:
-                self.logger.error("Failed to send result to Discord")
-                self.stats["errors"] += 1
+                self.logger.warning("No Discord route accepted the result")
             
-            # Send to local HTML
-            if self.local_html.send_result(result):
-                self.stats["local_html_sent"] += 1
-                self.logger.info("Result sent to local HTML successfully")
+            # Push to local feed subscribers
+            self.feed.publish(result)
+            
+            # Queue for local HTML; undelivered results are retried from the outbox
+            if self.local_html.enqueue_result(result):
+                self.stats["local_html_queued"] += 1
             else:
-                self.logger.warning("Failed to send result to local HTML")
+                self.logger.warning("Local HTML queue full, result kept in outbox for retry")
             
             # Save result to file
             self._save_result(result)
@@ -161,22 +188,7 @@ class RouletteCollectorWorking:
     def _save_result(self, result: RouletteResult):
         """Save result to local file"""
         try:
-            filename = f"{Config.DATA_DIR}/results_{datetime.now().strftime('%Y%m%d')}.json"
-            
-            # Load existing results
-            try:
-                with open(filename, 'r') as f:
-                    results = json.load(f)
-            except FileNotFoundError:
-                results = []
-            
-            # Add new result
-            results.append(result.to_dict())
-            
-            # Save back to file
-            with open(filename, 'w') as f:
-                json.dump(results, f, indent=2)
-                
+            self.store.append(result)
         except Exception as e:
             self.logger.error(f"Error saving result to file: {str(e)}")
     
@@ -189,12 +201,25 @@ class RouletteCollectorWorking:
         self.running = False
         
         try:
+            # Deliver queued Discord and local HTML notifications
+            self.discord.close()
+            self.local_html.close()
+            
+            # Stop the local result feed
+            self.feed.stop()
+            
+            # Stop health probes
+            self.health.stop()
+            
             # Send shutdown notification
             self.discord.send_shutdown_message()
             
             # Close browser connection
             self.connector.close()
             
+            # Close result store
+            self.store.close()
+            
             # Print final statistics
             self._print_final_stats()
             
@@ -211,8 +236,11 @@ class RouletteCollectorWorking:
         
         self.logger.info("Final Statistics:")
         self.logger.info(f"  Results Collected: {self.stats['results_collected']}")
-        self.logger.info(f"  Discord Sent: {self.stats['discord_sent']}")
-        self.logger.info(f"  Local HTML Sent: {self.stats['local_html_sent']}")
+        self.logger.info(f"  Discord Queued: {self.stats['discord_queued']}")
+        self.logger.info(f"  Discord Delivered: {self.discord.delivered}")
+        self.logger.info(f"  Local HTML Queued: {self.stats['local_html_queued']}")
+        if self.local_html.queue:
+            self.logger.info(f"  Local HTML Delivered: {self.local_html.queue.stats['delivered']}")
         self.logger.info(f"  Errors: {self.stats['errors']}")
     
     def get_status(self) -> dict:
@@ -221,7 +249,10 @@ class RouletteCollectorWorking:
             "running": self.running,
             "stats": self.stats,
             "connector": self.connector.get_status(),
-            "local_html": self.local_html.get_status()
+            "discord": self.discord.get_status(),
+            "local_html": self.local_html.get_status(),
+            "feed": self.feed.get_status(),
+            "health": self.health.get_status()
         }
 
 def main():
@@ -8,27 +8,30 @@ import time
 import logging
 import signal
 import sys
-import json
 from datetime import datetime
 from typing import Optional
 
 from config import Config
-from discord_notifier import DiscordNotifier
+from notification_router import NotificationRouter
 from local_html_client import LocalHTMLClient
+from feed_server import ResultFeedServer
+from result_store import create_result_store
 from roulette_result import RouletteResult, get_color_for_number
 
 class ManualRouletteCollector:
     """Manual collector that connects to existing browser session"""
     
     def __init__(self):
-        self.discord = DiscordNotifier()
+        self.discord = NotificationRouter()
         self.local_html = LocalHTMLClient()
+        self.feed = ResultFeedServer()
+        self.store = create_result_store()
         self.logger = self._setup_logging()
         self.running = False
         self.stats = {
             "results_collected": 0,
-            "discord_sent": 0,
-            "local_html_sent": 0,
+            "discord_queued": 0,
+            "local_html_queued": 0,
             "errors": 0,
             "start_time": None
         }
@@ -62,6 +65,9 @@ class ManualRouletteCollector:
             # Create necessary directories
             Config.create_directories()
             
+            # Serve the local result feed
+            self.feed.start()
+            
             # Send startup notification
             self.discord.send_startup_message()
             
@@ -130,20 +136,20 @@ class ManualRouletteCollector:
             self.logger.info(f"New result detected: {result.number} ({result.color})")
             self.stats["results_collected"] += 1
             
-            # Send to Discord
-            if self.discord.send_result(result):
-                self.stats["discord_sent"] += 1
-                self.logger.info("Result sent to Discord successfully")
+            # Queue for Discord; delivery happens on background workers
+            if self.discord.enqueue_result(result):
+                self.stats["discord_queued"] += 1
             else:
-                self.logger.error("Failed to send result to Discord")
-                self.stats["errors"] += 1
+                self.logger.warning("No Discord route accepted the result")
+            
+            # Push to local feed subscribers
+            self.feed.publish(result)
             
-            # Send to local HTML
-            if self.local_html.send_result(result):
-                self.stats["local_html_sent"] += 1
-                self.logger.info("Result sent to local HTML successfully")
+            # Queue for local HTML; undelivered results are retried from the outbox
+            if self.local_html.enqueue_result(result):
+                self.stats["local_html_queued"] += 1
             else:
-                self.logger.warning("Failed to send result to local HTML")
+                self.logger.warning("Local HTML queue full, result kept in outbox for retry")
             
             # Save result to file
             self._save_result(result)
@@ -155,22 +161,7 @@ class ManualRouletteCollector:
     def _save_result(self, result: RouletteResult):
         """Save result to local file"""
         try:
-            filename = f"{Config.DATA_DIR}/results_{datetime.now().strftime('%Y%m%d')}.json"
-            
-            # Load existing results
-            try:
-                with open(filename, 'r') as f:
-                    results = json.load(f)
-            except FileNotFoundError:
-                results = []
-            
-            # Add new result
-            results.append(result.to_dict())
-            
-            # Save back to file
-            with open(filename, 'w') as f:
-                json.dump(results, f, indent=2)
-                
+            self.store.append(result)
         except Exception as e:
             self.logger.error(f"Error saving result to file: {str(e)}")
     
@@ -183,9 +174,19 @@ class ManualRouletteCollector:
         self.running = False
         
         try:
+            # Deliver queued Discord and local HTML notifications
+            self.discord.close()
+            self.local_html.close()
+            
+            # Stop the local result feed
+            self.feed.stop()
+            
             # Send shutdown notification
             self.discord.send_shutdown_message()
             
+            # Close result store
+            self.store.close()
+            
             # Print final statistics
             self._print_final_stats()
             
@@ -202,8 +203,11 @@ class ManualRouletteCollector:
         
         self.logger.info("Final Statistics:")
         self.logger.info(f"  Results Collected: {self.stats['results_collected']}")
-        self.logger.info(f"  Discord Sent: {self.stats['discord_sent']}")
-        self.logger.info(f"  Local HTML Sent: {self.stats['local_html_sent']}")
+        self.logger.info(f"  Discord Queued: {self.stats['discord_queued']}")
+        self.logger.info(f"  Discord Delivered: {self.discord.delivered}")
+        self.logger.info(f"  Local HTML Queued: {self.stats['local_html_queued']}")
+        if self.local_html.queue:
+            self.logger.info(f"  Local HTML Delivered: {self.local_html.queue.stats['delivered']}")
         self.logger.info(f"  Errors: {self.stats['errors']}")
     
     def get_status(self) -> dict:
@@ -211,7 +215,9 @@ class ManualRouletteCollector:
         return {
             "running": self.running,
             "stats": self.stats,
-            "local_html": self.local_html.get_status()
+            "discord": self.discord.get_status(),
+            "local_html": self.local_html.get_status(),
+            "feed": self.feed.get_status()
         }
 
 def main():
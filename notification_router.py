@@ -0,0 +1,115 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from roulette_result import RouletteResult
+from discord_notifier import DiscordNotifier
+from config import Config
+
+class Route:
+    """One Discord destination and the results it receives"""
+
+    def __init__(self, name: str, webhook_url: str, tables: Optional[List[str]] = None,
+                 status: bool = True, workers: int = None, digest_spins: int = None,
+                 digest_minutes: float = None):
+        self.name = name
+        self.tables = set(tables) if tables else None
+        self.status = status
+        # Each destination has its own queue, workers, outbox and rate limit bucket
+        self.notifier = DiscordNotifier(webhook_url, sink=name, workers=workers,
+                                        digest_spins=digest_spins, digest_minutes=digest_minutes)
+
+    def accepts(self, result: RouletteResult) -> bool:
+        return self.tables is None or result.table_name in self.tables
+
+def parse_routes(spec: str) -> List[dict]:
+    """Parse the DISCORD_ROUTES JSON; an empty spec routes everything to DISCORD_WEBHOOK_URL"""
+    if not spec.strip():
+        return [{"name": "discord", "webhook_url": Config.DISCORD_WEBHOOK_URL}]
+
+    routes = json.loads(spec)
+    if not isinstance(routes, list) or not routes:
+        raise ValueError("DISCORD_ROUTES must be a non-empty JSON list")
+
+    names = set()
+    for route in routes:
+        if not route.get("name") or not route.get("webhook_url"):
+            raise ValueError(f"Route needs a name and a webhook_url: {route}")
+        if route["name"] in names:
+            raise ValueError(f"Duplicate route name: {route['name']}")
+        names.add(route["name"])
+    return routes
+
+class NotificationRouter:
+    """Fans results out to several Discord destinations without one holding up another"""
+
+    def __init__(self, routes: List[dict] = None):
+        self.logger = logging.getLogger(__name__)
+        self.routes = [
+            Route(r["name"], r["webhook_url"], r.get("tables"), r.get("status", True), r.get("workers"),
+                  r.get("digest_spins"), r.get("digest_minutes"))
+            for r in (routes if routes is not None else parse_routes(Config.DISCORD_ROUTES))
+        ]
+        self.logger.info(f"Routing notifications to {len(self.routes)} destination(s): "
+                         f"{', '.join(route.name for route in self.routes)}")
+
+    def enqueue_result(self, result: RouletteResult) -> bool:
+        """Queue a result on every matching destination; True if at least one accepted it"""
+        queued = False
+        for route in self.routes:
+            if route.accepts(result):
+                if route.notifier.enqueue_result(result):
+                    queued = True
+                else:
+                    self.logger.warning(f"Discord route {route.name} is backed up, result kept in its outbox")
+        return queued
+
+    def enqueue_status_message(self, message: str, color: int = 0x00ff00) -> bool:
+        """Queue a status message for every destination that takes status messages"""
+        return self._broadcast(lambda notifier: notifier.enqueue_status_message(message, color))
+
+    def _broadcast(self, send) -> bool:
+        """Run a send against every status destination in parallel; True if all succeeded"""
+        notifiers = [route.notifier for route in self.routes if route.status]
+        if not notifiers:
+            return True
+        with ThreadPoolExecutor(max_workers=len(notifiers)) as executor:
+            return all(executor.map(send, notifiers))
+
+    def send_status_message(self, message: str, color: int = 0x00ff00) -> bool:
+        """Send a status message to every destination that takes status messages"""
+        return self._broadcast(lambda notifier: notifier.send_status_message(message, color))
+
+    def send_error_message(self, error: str) -> bool:
+        return self._broadcast(lambda notifier: notifier.send_error_message(error))
+
+    def send_startup_message(self) -> bool:
+        return self._broadcast(lambda notifier: notifier.send_startup_message())
+
+    def send_shutdown_message(self) -> bool:
+        return self._broadcast(lambda notifier: notifier.send_shutdown_message())
+
+    @property
+    def delivered(self) -> int:
+        """Messages delivered across all destinations"""
+        return sum(route.notifier.queue.stats["delivered"] for route in self.routes)
+
+    def get_status(self) -> dict:
+        """Get delivery status per destination"""
+        return {
+            "routes": {
+                route.name: {
+                    "tables": sorted(route.tables) if route.tables else "all",
+                    **route.notifier.get_status()
+                }
+                for route in self.routes
+            }
+        }
+
+    def close(self, timeout: float = 15):
+        """Drain every destination in parallel"""
+        if not self.routes:
+            return
+        with ThreadPoolExecutor(max_workers=len(self.routes)) as executor:
+            list(executor.map(lambda route: route.notifier.close(timeout), self.routes))
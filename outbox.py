@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Callable, List, Tuple
+
+from roulette_result import RouletteResult
+from config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sink TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_sink_state ON outbox (sink, state, id);
+"""
+
+# pending: waiting for a (re)try, queued: handed to a delivery queue, delivered: done,
+# dead: gave up after OUTBOX_MAX_ATTEMPTS failed deliveries
+STATES = ("pending", "queued", "delivered", "dead")
+
+class Outbox:
+    """Durable per-sink record of results still to be delivered"""
+
+    def __init__(self, sink: str, db_path: str = None):
+        self.sink = sink
+        self.db_path = db_path or Config.OUTBOX_DB_PATH
+        self.retry_base = Config.OUTBOX_RETRY_BASE_SECONDS
+        self.retry_max = Config.OUTBOX_RETRY_MAX_SECONDS
+        self.max_attempts = Config.OUTBOX_MAX_ATTEMPTS
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        # Records a previous run had queued never reached the sink
+        recovered = self._conn.execute(
+            "UPDATE outbox SET state = 'pending', next_attempt = 0 WHERE sink = ? AND state = 'queued'",
+            (self.sink,)
+        ).rowcount
+        self._conn.commit()
+        if recovered:
+            self.logger.info(f"Recovered {recovered} undelivered {self.sink} notification(s)")
+
+        self.prune()
+
+    def add(self, result: RouletteResult) -> int:
+        """Record a result that is about to be queued for delivery"""
+        return self.add_many([result])[0]
+
+    def add_many(self, results: List[RouletteResult], state: str = "queued") -> List[int]:
+        """Record several results in one transaction and return their ids in order"""
+        if not results:
+            return []
+        now = time.time()
+        with self._lock:
+            ids = []
+            for result in results:
+                cursor = self._conn.execute(
+                    "INSERT INTO outbox (sink, payload, state, created, updated) VALUES (?, ?, ?, ?, ?)",
+                    (self.sink, json.dumps(result.to_dict()), state, now, now)
+                )
+                ids.append(cursor.lastrowid)
+            self._conn.commit()
+            return ids
+
+    def claim_due(self, limit: int) -> List[Tuple[int, RouletteResult]]:
+        """Mark the oldest records due for a retry as queued and return them in order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload FROM outbox WHERE sink = ? AND state = 'pending' AND next_attempt <= ? "
+                "ORDER BY id LIMIT ?",
+                (self.sink, time.time(), limit)
+            ).fetchall()
+            if not rows:
+                return []
+
+            self._set_state([row[0] for row in rows], "queued")
+            self._conn.commit()
+
+        return [(row[0], RouletteResult.from_dict(json.loads(row[1]))) for row in rows]
+
+    def _set_state(self, ids: List[int], state: str):
+        self._conn.executemany(
+            "UPDATE outbox SET state = ?, updated = ? WHERE id = ?",
+            [(state, time.time(), record_id) for record_id in ids]
+        )
+
+    def mark_delivered(self, ids: List[int]):
+        """Record a successful delivery"""
+        if not ids:
+            return
+        with self._lock:
+            self._set_state(ids, "delivered")
+            self._conn.commit()
+
+    def mark_failed(self, ids: List[int], error: str = None):
+        """Schedule another attempt with exponential backoff, or give up once the attempts run out"""
+        if not ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET state = CASE WHEN attempts + 1 >= ? THEN 'dead' ELSE 'pending' END, "
+                "attempts = attempts + 1, updated = ?, last_error = ?, "
+                "next_attempt = ? + min(? * (1 << min(attempts, 20)), ?) WHERE id = ?",
+                [(self.max_attempts, now, error, now, self.retry_base, self.retry_max, record_id) for record_id in ids]
+            )
+            dead = self._conn.execute(
+                f"SELECT COUNT(*) FROM outbox WHERE state = 'dead' AND updated = ? "
+                f"AND id IN ({','.join('?' * len(ids))})",
+                [now, *ids]
+            ).fetchone()[0]
+            self._conn.commit()
+
+        if dead:
+            self.logger.warning(f"Giving up on {dead} {self.sink} notification(s) after "
+                                f"{self.max_attempts} attempts: {error}")
+
+    def release(self, ids: List[int]):
+        """Return queued records to pending without counting an attempt, e.g. after a queue drop"""
+        if not ids:
+            return
+        with self._lock:
+            self._set_state(ids, "pending")
+            self._conn.commit()
+
+    def prune(self):
+        """Forget delivered records past the retention period"""
+        cutoff = time.time() - Config.OUTBOX_RETENTION_HOURS * 3600
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM outbox WHERE sink = ? AND state = 'delivered' AND updated < ?",
+                (self.sink, cutoff)
+            )
+            self._conn.commit()
+
+    def counts(self) -> dict:
+        """Number of records in each state"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM outbox WHERE sink = ? GROUP BY state", (self.sink,)
+            ).fetchall()
+        counts = {state: 0 for state in STATES}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class OutboxReplayer:
+    """Background thread handing due outbox records back to a sink in batches"""
+
+    def __init__(self, outbox: Outbox, submit_batch: Callable[[List[Tuple[int, RouletteResult]]], bool],
+                 batch_size: int, interval: float = None, limit: int = None):
+        self.outbox = outbox
+        self.submit_batch = submit_batch
+        self.batch_size = batch_size
+        self.interval = interval or Config.OUTBOX_REPLAY_INTERVAL_SECONDS
+        self.limit = limit or Config.OUTBOX_REPLAY_LIMIT
+        self.logger = logging.getLogger(__name__)
+        self.replayed = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"{outbox.sink}-outbox", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        # The first pass runs immediately, so a backlog from the last run drains on start
+        while not self._stop.is_set():
+            try:
+                self.replay()
+            except Exception as e:
+                self.logger.error(f"Error replaying {self.outbox.sink} outbox: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def replay(self) -> int:
+        """Submit due records in order; returns how many were handed over"""
+        records = self.outbox.claim_due(self.limit)
+        submitted = 0
+
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            if not self.submit_batch(batch):
+                # The sink is backed up; try the rest on the next pass
+                self.outbox.release([record_id for record_id, _ in records[start:]])
+                break
+            submitted += len(batch)
+
+        if submitted:
+            self.replayed += submitted
+            self.logger.info(f"Replayed {submitted} undelivered {self.outbox.sink} notification(s)")
+        return submitted
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=5)
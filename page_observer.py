@@ -0,0 +1,238 @@
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from typing import List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from config import Config
+
+# Installs a MutationObserver that pushes each newly shown winning number into window.__rouletteQueue.
+# Numbers already on the page when it is armed are the baseline and are not pushed.
+OBSERVER_SCRIPT = """
+const selectors = arguments[0];
+const maxQueue = arguments[1];
+// A DevTools client takes entries through its binding and never drains the queue; when it
+// gives way to polling, whatever reached the queue meanwhile has already been reported
+const viaBinding = Boolean(arguments[2]);
+if (window.__rouletteViaBinding && !viaBinding) {
+    window.__rouletteQueue = [];
+}
+window.__rouletteViaBinding = viaBinding;
+if (window.__rouletteObserver) {
+    return false;
+}
+
+window.__rouletteQueue = [];
+// Per element, the number and round last seen there
+const seen = new WeakMap();
+// Nodes mutated since the last scan: the same number re-rendered in place is a new spin
+let touched = [];
+
+const parse = (element) => {
+    const values = [(element.innerText || '').trim(), element.dataset.result, element.dataset.number,
+                    element.dataset.winningNumber];
+    for (const value of values) {
+        if (value && /^\\d{1,2}$/.test(value.trim()) && Number(value) <= 36) {
+            return Number(value);
+        }
+    }
+    return null;
+};
+
+const scan = (emit) => {
+    let entry = null;
+    for (const selector of selectors) {
+        let elements;
+        try {
+            elements = document.querySelectorAll(selector);
+        } catch (e) {
+            continue;
+        }
+        for (const element of elements) {
+            const number = parse(element);
+            if (number === null) {
+                continue;
+            }
+            const round = element.closest('[data-round-id],[data-game-id]');
+            const roundId = round ? (round.dataset.roundId || round.dataset.gameId) : null;
+            const key = number + '|' + roundId;
+            const rendered = emit && touched.some((node) => element.contains(node));
+            if (seen.get(element) === key && !rendered) {
+                continue;
+            }
+            seen.set(element, key);
+            // One spin is one result: keep the highest-priority change in this batch of mutations.
+            // Repeats of the same spin are left to the collector's dedupe
+            if (emit && entry === null) {
+                entry = {
+                    number: number,
+                    selector: selector,
+                    timestamp: performance.timeOrigin + performance.now(),
+                    roundId: roundId
+                };
+            }
+        }
+    }
+    touched = [];
+    if (entry !== null) {
+        // Installed by Runtime.addBinding when a DevTools client is listening
+        if (window.__rouletteViaBinding && typeof window.__roulettePush === 'function') {
+            window.__roulettePush(JSON.stringify(entry));
+            return;
+        }
+        window.__rouletteQueue.push(entry);
+        if (window.__rouletteQueue.length > maxQueue) {
+            window.__rouletteQueue.shift();
+        }
+        if (window.__rouletteWaiter) {
+            const waiter = window.__rouletteWaiter;
+            window.__rouletteWaiter = null;
+            waiter();
+        }
+    }
+};
+
+scan(false);
+
+// Coalesce bursts of mutations into at most one scan per 50 ms
+let scheduled = false;
+window.__rouletteObserver = new MutationObserver((records) => {
+    for (const record of records) {
+        touched.push(record.target);
+    }
+    if (!scheduled) {
+        scheduled = true;
+        setTimeout(() => { scheduled = false; scan(true); }, 50);
+    }
+});
+window.__rouletteObserver.observe(document.body, {
+    childList: true,
+    subtree: true,
+    characterData: true,
+    attributes: true,
+    attributeFilter: ['data-result', 'data-number', 'data-winning-number', 'data-round-id', 'data-game-id']
+});
+return true;
+"""
+
+# Long-poll: returns queued entries as soon as there are any, [] after the timeout,
+# or null when the observer is gone (the page was reloaded)
+WAIT_SCRIPT = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+if (!window.__rouletteObserver) {
+    done(null);
+    return;
+}
+const drain = () => {
+    const entries = window.__rouletteQueue;
+    window.__rouletteQueue = [];
+    return entries;
+};
+if (window.__rouletteQueue.length) {
+    done(drain());
+    return;
+}
+const timer = setTimeout(() => {
+    window.__rouletteWaiter = null;
+    done(drain());
+}, timeoutMs);
+window.__rouletteWaiter = () => {
+    clearTimeout(timer);
+    done(drain());
+};
+"""
+
+class ArmBackoff:
+    """Exponential delay between attempts to re-arm the observer, so a dead browser isn't hammered"""
+
+    def __init__(self, logger, initial: float = None, maximum: float = 60, warn_interval: float = 60):
+        self.logger = logger
+        self.initial = initial or max(Config.SCAN_INTERVAL_SECONDS, 1)
+        self.maximum = maximum
+        self.warn_interval = warn_interval
+        self.delay = 0.0
+        self._retry_at = 0.0
+        self._last_warning = None
+
+    def ready(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def failed(self, message: str):
+        self.delay = min(self.maximum, self.delay * 2 if self.delay else self.initial)
+        now = time.monotonic()
+        self._retry_at = now + self.delay
+
+        # The same failure repeats every retry; only warn about it once a minute
+        if self._last_warning is None or now - self._last_warning >= self.warn_interval:
+            self._last_warning = now
+            self.logger.warning(f"{message} (retrying in {self.delay:g}s)")
+        else:
+            self.logger.debug(message)
+
+    def succeeded(self):
+        self.delay = 0.0
+        self._retry_at = 0.0
+        self._last_warning = None
+
+class PageObserver:
+    """Event-driven detection: the page pushes new numbers, the collector long-polls for them"""
+
+    def __init__(self, driver, selectors: List[str], wait_ms: int = None, max_queue: int = 100):
+        self.driver = driver
+        self.selectors = list(selectors)
+        self.wait_ms = wait_ms or Config.PUSH_WAIT_MS
+        self.max_queue = max_queue
+        self.logger = logging.getLogger(__name__)
+        self._pending = deque()
+        self._backoff = ArmBackoff(self.logger)
+        self.armed = False
+        # Seconds the last next_entry() spent blocked in the page; 0 when it returned without waiting
+        self.waited = 0.0
+
+    def arm(self) -> bool:
+        """Install the observer in the current page; call again after a reload"""
+        try:
+            self.driver.execute_script(OBSERVER_SCRIPT, self.selectors, self.max_queue)
+            self.armed = True
+            self._backoff.succeeded()
+            self.logger.info("Result observer armed")
+        except WebDriverException as e:
+            self.armed = False
+            self._backoff.failed(f"Could not arm result observer: {str(e)}")
+        return self.armed
+
+    def _poll(self) -> list:
+        if not self.armed and (not self._backoff.ready() or not self.arm()):
+            return []
+
+        start = time.monotonic()
+        try:
+            # The script timeout must outlast the long-poll
+            self.driver.set_script_timeout(self.wait_ms / 1000 + 5)
+            entries = self.driver.execute_async_script(WAIT_SCRIPT, self.wait_ms)
+        except WebDriverException as e:
+            self.logger.debug(f"Observer poll failed: {str(e)}")
+            entries = None
+
+        if entries is None:
+            # Page reloaded or navigated; re-arm and pick up from the next spin
+            self.armed = False
+            self.arm()
+            return []
+
+        self.waited = time.monotonic() - start
+        return entries
+
+    def next_entry(self, wait: bool = True) -> Optional[dict]:
+        """Next pushed entry, long-polling for up to wait_ms when none is buffered"""
+        self.waited = 0.0
+        if not self._pending and wait:
+            self._pending.extend(self._poll())
+        return self._pending.popleft() if self._pending else None
+
+def entry_timestamp(entry: dict) -> datetime:
+    """Local time at which the page saw the number"""
+    return datetime.fromtimestamp(entry["timestamp"] / 1000)
@@ -0,0 +1,139 @@
+import time
+import logging
+import threading
+
+class RateLimitBucket:
+    """Discord rate limit bucket state, as last reported by the response headers"""
+
+    def __init__(self, bucket_id: str):
+        self.bucket_id = bucket_id
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+
+class WebhookRateLimiter:
+    """Schedules webhook sends around Discord's per-bucket and global rate limits"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._condition = threading.Condition()
+        self._routes = {}
+        self._buckets = {}
+        self._global_reset_at = 0.0
+        self.stats = {
+            "throttled": 0,
+            "rate_limited": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0
+        }
+
+    def _bucket_for(self, url: str) -> RateLimitBucket:
+        # Until Discord names the bucket, the URL stands in for it
+        bucket_id = self._routes.get(url, url)
+        bucket = self._buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self._buckets[bucket_id] = RateLimitBucket(bucket_id)
+        return bucket
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the URL fits within its limits; returns the seconds waited"""
+        start = time.monotonic()
+
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                bucket = self._bucket_for(url)
+
+                if bucket.reset_at <= now and bucket.limit is not None:
+                    bucket.remaining = bucket.limit
+
+                wait = self._global_reset_at - now
+                if bucket.remaining is not None and bucket.remaining <= 0:
+                    wait = max(wait, bucket.reset_at - now)
+
+                if wait <= 0:
+                    # Reserve the slot so concurrent senders don't overshoot it
+                    if bucket.remaining is not None:
+                        bucket.remaining -= 1
+                    break
+
+                self._condition.wait(wait)
+
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            with self._condition:
+                self.stats["throttled"] += 1
+                self.stats["wait_seconds"] += waited
+                self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+        return waited
+
+    def update(self, url: str, headers) -> None:
+        """Record the bucket state reported by a response"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+
+        with self._condition:
+            bucket_id = headers.get("X-RateLimit-Bucket")
+            if bucket_id and self._routes.get(url) != bucket_id:
+                self._routes[url] = bucket_id
+                self._buckets.pop(url, None)
+
+            bucket = self._bucket_for(url)
+            limit = headers.get("X-RateLimit-Limit")
+            if limit is not None:
+                bucket.limit = int(limit)
+            bucket.remaining = int(remaining)
+            bucket.reset_at = time.monotonic() + float(reset_after)
+            self._condition.notify_all()
+
+    def rate_limited(self, url: str, response) -> float:
+        """Handle a 429 response; returns the seconds to wait before retrying"""
+        retry_after = None
+        is_global = False
+        try:
+            body = response.json()
+            retry_after = float(body["retry_after"])
+            is_global = bool(body.get("global"))
+        except (ValueError, KeyError, TypeError):
+            pass
+
+        if retry_after is None:
+            retry_after = float(response.headers.get("Retry-After", 1))
+        is_global = is_global or response.headers.get("X-RateLimit-Global") == "true"
+
+        with self._condition:
+            self.stats["rate_limited"] += 1
+            reset_at = time.monotonic() + retry_after
+            if is_global:
+                self._global_reset_at = max(self._global_reset_at, reset_at)
+            else:
+                bucket = self._bucket_for(url)
+                bucket.remaining = 0
+                bucket.reset_at = max(bucket.reset_at, reset_at)
+            self._condition.notify_all()
+
+        self.logger.warning(f"Discord rate limited{' (global)' if is_global else ''}, retrying in {retry_after:.2f}s")
+        return retry_after
+
+    def get_status(self) -> dict:
+        """Get throttling statistics"""
+        with self._condition:
+            return {
+                **self.stats,
+                "wait_seconds": round(self.stats["wait_seconds"], 3),
+                "max_wait_seconds": round(self.stats["max_wait_seconds"], 3),
+                "buckets": len(self._buckets)
+            }
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> WebhookRateLimiter:
+    """Get the process-wide limiter, so every notifier sharing a webhook shares its buckets"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = WebhookRateLimiter()
+        return _limiter
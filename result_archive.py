@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Daily compaction of result files into compressed columnar archives
+"""
+
+import os
+import re
+import json
+import logging
+from collections import deque
+from datetime import date, datetime
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from roulette_result import RouletteResult, ROULETTE_COLORS
+from result_journal import journal_path, read_journal
+from spin_log import to_epoch_ms
+from import_results import iter_json_array
+from config import Config
+
+RESULT_FILE_PATTERN = re.compile(r"^results_(\d{8})\.jsonl?$")
+
+# Lookup tables indexed by pocket number, used to expand derived fields
+_COLORS = np.array([ROULETTE_COLORS[n] for n in range(37)])
+_HIGH_LOW = np.array(["zero"] + ["low"] * 18 + ["high"] * 18)
+
+def archive_path(day: date, data_dir: str = None) -> str:
+    """Get the archive file path for a given day"""
+    return os.path.join(data_dir or Config.DATA_DIR, f"results_{day.strftime('%Y%m%d')}.npz")
+
+def legacy_path(day: date, data_dir: str = None) -> str:
+    """Get the path of a day file written as one pretty-printed JSON array"""
+    return os.path.join(data_dir or Config.DATA_DIR, f"results_{day.strftime('%Y%m%d')}.json")
+
+def read_day_results(day: date, data_dir: str = None) -> List[RouletteResult]:
+    """Read every raw result recorded for a day, legacy array first, then the journal"""
+    results = []
+
+    path = legacy_path(day, data_dir)
+    if os.path.exists(path):
+        results.extend(RouletteResult.from_dict(entry) for entry in iter_json_array(path))
+
+    path = journal_path(day, data_dir)
+    if os.path.exists(path):
+        results.extend(read_journal(path))
+
+    return results
+
+def read_archived_tail(day: date, limit: int, table_name: Optional[str] = None,
+                       data_dir: str = None) -> List[RouletteResult]:
+    """Newest results for a day from its archive or legacy array, for days without a live journal"""
+    if limit <= 0:
+        return []
+
+    path = archive_path(day, data_dir)
+    if os.path.exists(path):
+        archive = DayArchive(path)
+        try:
+            if table_name is None:
+                indices = np.arange(len(archive))
+            elif table_name in archive.summary["tables"]:
+                indices = np.nonzero(archive.table_codes == archive.table_names.index(table_name))[0]
+            else:
+                return []
+            return list(archive.iter_results(indices[-limit:]))
+        finally:
+            archive.close()
+
+    path = legacy_path(day, data_dir)
+    if os.path.exists(path):
+        tail = deque(maxlen=limit)
+        for entry in iter_json_array(path):
+            result = RouletteResult.from_dict(entry)
+            if table_name is None or result.table_name == table_name:
+                tail.append(result)
+        return list(tail)
+
+    return []
+
+def _encode(values: list):
+    """Dictionary-encode a column of strings (None allowed) into codes and a vocabulary"""
+    vocabulary = []
+    index = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(vocabulary)
+            vocabulary.append(value)
+        codes[i] = code
+    return codes, vocabulary
+
+def summarize(day: date, numbers: np.ndarray, timestamps_ms: np.ndarray, tables: list, table_codes: np.ndarray) -> dict:
+    """Build the per-day summary stored in the archive header"""
+    counts = np.bincount(numbers, minlength=37)
+    colors = {color: int(counts[_COLORS == color].sum()) for color in ("red", "black", "green")}
+
+    return {
+        "day": day.isoformat(),
+        "count": int(len(numbers)),
+        "first_timestamp_ms": int(timestamps_ms.min()) if len(timestamps_ms) else None,
+        "last_timestamp_ms": int(timestamps_ms.max()) if len(timestamps_ms) else None,
+        "colors": colors,
+        "number_counts": counts.tolist(),
+        "tables": {name: int((table_codes == i).sum()) for i, name in enumerate(tables)}
+    }
+
+def write_archive(day: date, results: List[RouletteResult], path: str) -> dict:
+    """Write results as a compressed archive holding only primitive columns"""
+    results = sorted(results, key=lambda r: r.timestamp)
+
+    numbers = np.array([r.number for r in results], dtype=np.uint8)
+    timestamps_ms = np.array([to_epoch_ms(r.timestamp) for r in results], dtype=np.int64)
+    table_codes, tables = _encode([r.table_name for r in results])
+    session_codes, sessions = _encode([r.session_id for r in results])
+    summary = summarize(day, numbers, timestamps_ms, tables, table_codes)
+
+    # Write next to the target and swap in, so a crash never leaves half an archive
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(
+            f,
+            summary=np.array(json.dumps(summary)),
+            number=numbers,
+            timestamp_ms=timestamps_ms,
+            table=table_codes.astype(np.uint16),
+            tables=np.array(json.dumps(tables)),
+            session=session_codes.astype(np.uint16),
+            sessions=np.array(json.dumps(sessions))
+        )
+    os.replace(tmp_path, path)
+    return summary
+
+class DayArchive:
+    """Lazy reader for a compacted day; columns are decompressed on first use"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._npz = np.load(path)
+        self._cache = {}
+        self.summary = json.loads(str(self._npz["summary"]))
+
+    def __len__(self) -> int:
+        return self.summary["count"]
+
+    def _column(self, name: str):
+        if name not in self._cache:
+            self._cache[name] = self._npz[name]
+        return self._cache[name]
+
+    def _derived(self, name: str, compute):
+        if name not in self._cache:
+            self._cache[name] = compute(self.numbers)
+        return self._cache[name]
+
+    @property
+    def numbers(self) -> np.ndarray:
+        return self._column("number")
+
+    @property
+    def timestamps_ms(self) -> np.ndarray:
+        return self._column("timestamp_ms")
+
+    @property
+    def table_names(self) -> list:
+        if "table_names" not in self._cache:
+            self._cache["table_names"] = json.loads(str(self._npz["tables"]))
+        return self._cache["table_names"]
+
+    @property
+    def session_ids(self) -> list:
+        if "session_ids" not in self._cache:
+            self._cache["session_ids"] = json.loads(str(self._npz["sessions"]))
+        return self._cache["session_ids"]
+
+    @property
+    def colors(self) -> np.ndarray:
+        return self._derived("colors", lambda n: _COLORS[n])
+
+    @property
+    def is_even(self) -> np.ndarray:
+        return self._derived("is_even", lambda n: n % 2 == 0)
+
+    @property
+    def dozens(self) -> np.ndarray:
+        return self._derived("dozens", lambda n: np.where(n == 0, 0, (n.astype(np.int16) - 1) // 12 + 1))
+
+    @property
+    def columns(self) -> np.ndarray:
+        return self._derived("columns", lambda n: np.where(n == 0, 0, (n.astype(np.int16) - 1) % 3 + 1))
+
+    @property
+    def high_low(self) -> np.ndarray:
+        return self._derived("high_low", lambda n: _HIGH_LOW[n])
+
+    @property
+    def table_codes(self) -> np.ndarray:
+        return self._column("table")
+
+    def iter_results(self, indices: Optional[np.ndarray] = None) -> Iterator[RouletteResult]:
+        """Expand the archive (or the rows at the given indices) back into RouletteResult objects"""
+        tables = self.table_names
+        sessions = self.session_ids
+        columns = (self.numbers, self.timestamps_ms, self.table_codes, self._column("session"))
+        if indices is not None:
+            columns = tuple(column[indices] for column in columns)
+
+        for number, timestamp_ms, table_code, session_code in zip(*(column.tolist() for column in columns)):
+            yield RouletteResult(
+                number=number,
+                color=ROULETTE_COLORS[number],
+                timestamp=datetime.fromtimestamp(timestamp_ms / 1000),
+                table_name=tables[table_code],
+                session_id=sessions[session_code]
+            )
+
+    def close(self):
+        self._npz.close()
+
+def compact_day(day: date, data_dir: str = None, remove_source: bool = True) -> Optional[dict]:
+    """Compact one closed day into an archive; returns its summary, or None if nothing to do"""
+    logger = logging.getLogger(__name__)
+
+    if day >= datetime.now().date():
+        raise ValueError(f"Refusing to compact {day.isoformat()}: the day is not closed yet")
+
+    path = archive_path(day, data_dir)
+    if os.path.exists(path):
+        logger.info(f"Archive already exists for {day.isoformat()}")
+        return None
+
+    results = read_day_results(day, data_dir)
+    if not results:
+        return None
+
+    summary = write_archive(day, results, path)
+
+    # Only drop the sources once the archive reads back complete
+    archive = DayArchive(path)
+    try:
+        if len(archive.numbers) != len(results):
+            raise ValueError(f"Archive for {day.isoformat()} is incomplete")
+    finally:
+        archive.close()
+
+    if remove_source:
+        # The journal's sidecar block index goes with it
+        sidecar = os.path.join(data_dir or Config.DATA_DIR, f"results_{day.strftime('%Y%m%d')}.idx.json")
+        for source in (legacy_path(day, data_dir), journal_path(day, data_dir), sidecar):
+            if os.path.exists(source):
+                os.remove(source)
+
+    logger.info(f"Compacted {summary['count']} results for {day.isoformat()}")
+    return summary
+
+def compact_closed_days(data_dir: str = None, remove_source: bool = True) -> List[dict]:
+    """Compact every result file for a day before today"""
+    logger = logging.getLogger(__name__)
+    data_dir = data_dir or Config.DATA_DIR
+    today = datetime.now().date()
+
+    days = set()
+    for name in os.listdir(data_dir):
+        match = RESULT_FILE_PATTERN.match(name)
+        if match:
+            day = datetime.strptime(match.group(1), "%Y%m%d").date()
+            if day < today:
+                days.add(day)
+
+    summaries = []
+    for day in sorted(days):
+        try:
+            summary = compact_day(day, data_dir, remove_source)
+            if summary:
+                summaries.append(summary)
+        except Exception as e:
+            logger.error(f"Failed to compact {day.isoformat()}: {str(e)}")
+
+    return summaries
+
+def main():
+    """Compact all closed days in the data directory"""
+    logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL),
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    summaries = compact_closed_days()
+    print(f"Compacted {len(summaries)} day(s)")
+    for summary in summaries:
+        print(f"  {summary['day']}: {summary['count']} results")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import threading
+from datetime import datetime
+from typing import Optional
+
+from roulette_result import RouletteResult
+
+STREAK_LABELS = {
+    "red": "Red", "black": "Black", "green": "Zero",
+    "even": "Even", "odd": "Odd",
+    "low": "Low", "high": "High"
+}
+
+def _streak_keys(result: RouletteResult) -> tuple:
+    """Streak categories a result extends; zero breaks even/odd and high/low runs"""
+    if result.number == 0:
+        return (("color", result.color), ("parity", None), ("range", None))
+    return (("color", result.color),
+            ("parity", "even" if result.is_even else "odd"),
+            ("range", result.high_low))
+
+class ResultDigest:
+    """Running summary of results since the last digest, updated in constant time per result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Per table: {category: (value, length)}. Runs carry across digests, so a streak
+        # that spans a flush is reported at its full length
+        self._current = {}
+        self.reset()
+
+    def reset(self):
+        """Start a new digest period; only the per-period counts are cleared"""
+        self.count = 0
+        self.colors = {"red": 0, "black": 0, "green": 0}
+        self.dozens = [0, 0, 0, 0]
+        self.columns = [0, 0, 0, 0]
+        self.number_counts = [0] * 37
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.tables = set()
+        # {value: (length, table_name)}, the longest runs seen this period
+        self.longest = {}
+
+    def add(self, result: RouletteResult):
+        with self._lock:
+            self.count += 1
+            self.colors[result.color] = self.colors.get(result.color, 0) + 1
+            self.dozens[result.dozen] += 1
+            self.columns[result.column] += 1
+            self.number_counts[result.number] += 1
+            self.first_timestamp = self.first_timestamp or result.timestamp
+            self.last_timestamp = result.timestamp
+            self.tables.add(result.table_name)
+
+            current = self._current.setdefault(result.table_name, {})
+            for category, value in _streak_keys(result):
+                previous, length = current.get(category, (None, 0))
+                length = length + 1 if value is not None and value == previous else 1
+                current[category] = (value, length)
+                if value is not None and length > self.longest.get(value, (0, None))[0]:
+                    self.longest[value] = (length, result.table_name)
+
+    def take_embed(self) -> Optional[dict]:
+        """Build the digest embed and start a new period; None if nothing was collected"""
+        with self._lock:
+            if not self.count:
+                return None
+            embed = self._create_embed()
+            self.reset()
+            return embed
+
+    def _create_embed(self) -> dict:
+        # Sorting 37 counters is constant work regardless of how many spins were seen
+        by_count = sorted(range(37), key=lambda n: (-self.number_counts[n], n))
+        hot = ", ".join(f"{n} ({self.number_counts[n]})" for n in by_count[:5])
+        cold = ", ".join(f"{n} ({self.number_counts[n]})" for n in sorted(by_count[-5:], key=lambda n: (self.number_counts[n], n)))
+
+        streaks = " · ".join(
+            f"{STREAK_LABELS[value]} {length}"
+            for value, (length, _) in sorted(self.longest.items(), key=lambda item: -item[1][0])
+            if length > 1
+        ) or "None"
+
+        return {
+            "title": f"📊 Roulette Digest: {self.count} spins",
+            "description": f"{self.first_timestamp.strftime('%H:%M:%S')} – {self.last_timestamp.strftime('%H:%M:%S')}",
+            "color": 0x5865f2,
+            "fields": [
+                {
+                    "name": "Colors",
+                    "value": f"🔴 {self.colors['red']} · ⚫ {self.colors['black']} · 🟢 {self.colors['green']}",
+                    "inline": False
+                },
+                {
+                    "name": "Dozens",
+                    "value": f"1st {self.dozens[1]} · 2nd {self.dozens[2]} · 3rd {self.dozens[3]}",
+                    "inline": True
+                },
+                {
+                    "name": "Columns",
+                    "value": f"1st {self.columns[1]} · 2nd {self.columns[2]} · 3rd {self.columns[3]}",
+                    "inline": True
+                },
+                {
+                    "name": "Hot Numbers",
+                    "value": hot,
+                    "inline": False
+                },
+                {
+                    "name": "Cold Numbers",
+                    "value": cold,
+                    "inline": False
+                },
+                {
+                    "name": "Longest Streaks",
+                    "value": streaks,
+                    "inline": False
+                }
+            ],
+            "footer": {
+                "text": f"Table{'s' if len(self.tables) > 1 else ''}: {', '.join(sorted(self.tables))}"
+            },
+            "timestamp": datetime.utcnow().isoformat()
+        }
@@ -0,0 +1,76 @@
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from roulette_result import RouletteResult
+from result_journal import DayIndex
+from result_archive import archive_path, legacy_path, DayArchive
+from import_results import iter_json_array
+from spin_log import to_epoch_ms
+
+def _number_mask(numbers: Iterable[int]) -> int:
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
+
+def _query_archive(path: str, start: datetime, end: datetime, table_name: Optional[str],
+                   numbers: Optional[set]) -> Iterator[RouletteResult]:
+    """Range query against a compacted day using its summary and columns"""
+    archive = DayArchive(path)
+    try:
+        summary = archive.summary
+        start_ms, end_ms = to_epoch_ms(start), to_epoch_ms(end)
+
+        if not summary["count"] or summary["first_timestamp_ms"] >= end_ms or summary["last_timestamp_ms"] < start_ms:
+            return
+        if table_name is not None and table_name not in summary["tables"]:
+            return
+        if numbers is not None and not any(summary["number_counts"][n] for n in numbers):
+            return
+
+        timestamps = archive.timestamps_ms
+        mask = (timestamps >= start_ms) & (timestamps < end_ms)
+        if table_name is not None:
+            mask &= archive.table_codes == archive.table_names.index(table_name)
+        if numbers is not None:
+            mask &= np.isin(archive.numbers, list(numbers))
+
+        yield from archive.iter_results(np.nonzero(mask)[0])
+    finally:
+        archive.close()
+
+def query_range(start: datetime, end: datetime, table_name: Optional[str] = None,
+                numbers: Optional[Iterable[int]] = None, data_dir: str = None) -> Iterator[RouletteResult]:
+    """Stream results with start <= timestamp < end across daily files, in file order"""
+    numbers = set(numbers) if numbers is not None else None
+    number_mask = _number_mask(numbers) if numbers is not None else None
+    start_ms, end_ms = to_epoch_ms(start), to_epoch_ms(end)
+
+    def matches(result: RouletteResult) -> bool:
+        return start <= result.timestamp < end \
+            and (table_name is None or result.table_name == table_name) \
+            and (numbers is None or result.number in numbers)
+
+    day = start.date()
+    while day <= end.date():
+        # Days written before the journal existed are one JSON array with no index; stream and filter them
+        legacy = legacy_path(day, data_dir)
+        if os.path.exists(legacy):
+            for entry in iter_json_array(legacy):
+                result = RouletteResult.from_dict(entry)
+                if matches(result):
+                    yield result
+
+        index = DayIndex(day, data_dir)
+
+        # Catch up on the unindexed tail in memory; the sidecar belongs to the collector writing the journal
+        if index.update(save=False):
+            blocks = index.candidate_blocks(start_ms, end_ms, table_name, number_mask)
+            yield from filter(matches, index.read_blocks(blocks))
+        elif os.path.exists(archive_path(day, data_dir)):
+            yield from _query_archive(archive_path(day, data_dir), start, end, table_name, numbers)
+
+        day += timedelta(days=1)
@@ -0,0 +1,328 @@
+import os
+import json
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, List, Optional
+
+from roulette_result import RouletteResult
+from spin_log import to_epoch_ms
+from config import Config
+
+INDEX_VERSION = 1
+
+def journal_path(day: date, data_dir: str = None) -> str:
+    """Get the journal file path for a given day"""
+    return os.path.join(data_dir or Config.DATA_DIR, f"results_{day.strftime('%Y%m%d')}.jsonl")
+
+def read_journal(path: str) -> Iterator[RouletteResult]:
+    """Stream results back from a journal file, one line at a time"""
+    logger = logging.getLogger(__name__)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                yield RouletteResult.from_dict(json.loads(line))
+            except (ValueError, KeyError) as e:
+                # A torn last line after a crash only loses that one record
+                logger.warning(f"Skipping unreadable journal line {path}:{line_number}: {str(e)}")
+
+def read_journal_tail(path: str, limit: int, table_name: Optional[str] = None,
+                      chunk_size: int = 65536) -> List[RouletteResult]:
+    """Read the newest results from the end of a journal without parsing the rest of it"""
+    results = []
+
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+
+        while position > 0 and len(results) < limit:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+
+            # The first piece may be the tail end of a line that starts in the previous chunk
+            remainder = lines.pop(0) if position > 0 else b""
+
+            for line in reversed(lines):
+                if len(results) >= limit:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    result = RouletteResult.from_dict(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+                if table_name is None or result.table_name == table_name:
+                    results.append(result)
+
+    results.reverse()
+    return results
+
+def index_path(day: date, data_dir: str = None) -> str:
+    """Get the sidecar index path for a day's journal"""
+    return os.path.join(data_dir or Config.DATA_DIR, f"results_{day.strftime('%Y%m%d')}.idx.json")
+
+class DayIndex:
+    """Sparse block index over one day's result journal"""
+
+    def __init__(self, day: date, data_dir: str = None, block_size: int = None):
+        self.day = day
+        self.data_dir = data_dir or Config.DATA_DIR
+        self.block_size = block_size or Config.INDEX_BLOCK_SIZE
+        self.logger = logging.getLogger(__name__)
+        self.journal = journal_path(day, self.data_dir)
+        self.path = index_path(day, self.data_dir)
+        self.indexed_bytes = 0
+        self.blocks = []
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+
+        if data.get("version") != INDEX_VERSION or data.get("block_size") != self.block_size:
+            return
+
+        self.indexed_bytes = data["indexed_bytes"]
+        self.blocks = data["blocks"]
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "block_size": self.block_size,
+                "indexed_bytes": self.indexed_bytes,
+                "blocks": self.blocks
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def update(self, save: bool = True) -> bool:
+        """Index whatever has been appended to the journal since the last update; readers pass save=False"""
+        if not os.path.exists(self.journal):
+            return False
+
+        size = os.path.getsize(self.journal)
+        if size < self.indexed_bytes:
+            # The journal was replaced; start over
+            self.indexed_bytes = 0
+            self.blocks = []
+        if size == self.indexed_bytes:
+            return True
+
+        # Re-open a trailing partial block so blocks stay full-sized
+        if self.blocks and self.blocks[-1]["count"] < self.block_size:
+            last = self.blocks.pop()
+            self.indexed_bytes = last["offset"]
+
+        with open(self.journal, 'rb') as f:
+            f.seek(self.indexed_bytes)
+            offset = self.indexed_bytes
+            block = None
+
+            for line in f:
+                # Leave a line that is still being written for the next update
+                if not line.endswith(b"\n"):
+                    break
+
+                if block is None:
+                    block = {"offset": offset, "length": 0, "count": 0, "min_ts": None,
+                             "max_ts": None, "tables": [], "numbers": 0}
+
+                block["length"] += len(line)
+                offset += len(line)
+
+                try:
+                    entry = json.loads(line)
+                    timestamp_ms = to_epoch_ms(datetime.fromisoformat(entry["timestamp"]))
+                except (ValueError, KeyError):
+                    continue
+
+                block["count"] += 1
+                block["min_ts"] = timestamp_ms if block["min_ts"] is None else min(block["min_ts"], timestamp_ms)
+                block["max_ts"] = timestamp_ms if block["max_ts"] is None else max(block["max_ts"], timestamp_ms)
+                block["numbers"] |= 1 << entry["number"]
+                if entry["table_name"] not in block["tables"]:
+                    block["tables"].append(entry["table_name"])
+
+                if block["count"] >= self.block_size:
+                    self.blocks.append(block)
+                    block = None
+
+            if block is not None and block["count"]:
+                self.blocks.append(block)
+
+        self.indexed_bytes = offset
+        if save:
+            self._save()
+        return True
+
+    def candidate_blocks(self, start_ms: int, end_ms: int, table_name: Optional[str] = None,
+                         number_mask: Optional[int] = None) -> List[dict]:
+        """Blocks whose summaries do not rule out the query"""
+        return [
+            block for block in self.blocks
+            if block["min_ts"] < end_ms and block["max_ts"] >= start_ms
+            and (table_name is None or table_name in block["tables"])
+            and (number_mask is None or block["numbers"] & number_mask)
+        ]
+
+    def read_blocks(self, blocks: List[dict]) -> Iterator[RouletteResult]:
+        """Read the results stored in the given blocks"""
+        with open(self.journal, 'rb') as f:
+            for block in blocks:
+                f.seek(block["offset"])
+                for line in f.read(block["length"]).splitlines():
+                    try:
+                        yield RouletteResult.from_dict(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue
+
+class ResultJournal:
+    """Append-only JSON Lines journal of roulette results, one file per day"""
+
+    def __init__(self, data_dir: str = None):
+        self.data_dir = data_dir or Config.DATA_DIR
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._file = None
+        self._day = None
+        # The day's block index is brought up to date each time a block fills and when the day is closed
+        self._index = None
+        self._unindexed = 0
+
+    def append(self, result: RouletteResult):
+        """Append one result as a compact JSON line"""
+        line = json.dumps(result.to_dict(), separators=(',', ':')) + "\n"
+
+        with self._lock:
+            self._get_file(result.timestamp.date()).write(line)
+            self._appended(1)
+
+    def append_many(self, results: Iterable[RouletteResult]):
+        """Append several results with one write per day file"""
+        chunks = {}
+        for result in results:
+            line = json.dumps(result.to_dict(), separators=(',', ':')) + "\n"
+            chunks.setdefault(result.timestamp.date(), []).append(line)
+
+        with self._lock:
+            for day, lines in chunks.items():
+                self._get_file(day).write("".join(lines))
+                self._appended(len(lines))
+
+    def _appended(self, count: int):
+        self._unindexed += count
+        if self._unindexed >= self._index.block_size:
+            self._update_index()
+
+    def _update_index(self):
+        self._unindexed = 0
+        try:
+            self._index.update()
+        except Exception as e:
+            self.logger.error(f"Error updating result index: {str(e)}")
+
+    def _get_file(self, day: date):
+        """Get the open journal file for a day, rolling over when the day changes"""
+        if self._file is None or day != self._day:
+            self._close_file()
+            os.makedirs(self.data_dir, exist_ok=True)
+
+            path = journal_path(day, self.data_dir)
+            torn_tail = self._has_torn_tail(path)
+
+            # Line buffered, so every record reaches the OS as soon as it is written
+            self._file = open(path, 'a', encoding='utf-8', buffering=1)
+            self._day = day
+            self._index = DayIndex(day, self.data_dir)
+
+            # Terminate a line left half-written by a crash so it cannot swallow the next record
+            if torn_tail:
+                self._file.write("\n")
+            self.logger.debug(f"Opened result journal for {day.isoformat()}")
+
+        return self._file
+
+    def _has_torn_tail(self, path: str) -> bool:
+        """Check whether an existing journal ends without a trailing newline"""
+        try:
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def flush(self):
+        """Flush buffered lines to the operating system"""
+        with self._lock:
+            if self._file:
+                self._file.flush()
+
+    def sync(self):
+        """Flush and fsync the current journal file to stable storage"""
+        with self._lock:
+            if self._file:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the current journal file"""
+        with self._lock:
+            self._close_file()
+
+    def _close_file(self):
+        if self._file:
+            try:
+                self._file.close()
+            except Exception as e:
+                self.logger.error(f"Error closing result journal: {str(e)}")
+            # Rollover or shutdown: index the rest of the day so queries never scan it
+            self._update_index()
+            self._file = None
+            self._day = None
+            self._index = None
+
+    def read_day(self, day: Optional[date] = None) -> Iterator[RouletteResult]:
+        """Stream all results journaled for a day (defaults to today)"""
+        path = journal_path(day or datetime.now().date(), self.data_dir)
+        if not os.path.exists(path):
+            return iter(())
+        return read_journal(path)
+
+    def recent(self, table_name: str, limit: int, lookback_days: int = None) -> List[RouletteResult]:
+        """Get the newest results for a table by reading journal tails, newest day first"""
+        # Imported here because result_archive builds on this module
+        from result_archive import read_archived_tail
+
+        lookback_days = lookback_days if lookback_days is not None else Config.WARM_START_LOOKBACK_DAYS
+        if limit <= 0:
+            return []
+        today = datetime.now().date()
+        results = []
+
+        for days_ago in range(lookback_days + 1):
+            day = today - timedelta(days=days_ago)
+            path = journal_path(day, self.data_dir)
+            if os.path.exists(path):
+                results = read_journal_tail(path, limit - len(results), table_name) + results
+            # Closed days may have been compacted, or predate the journal
+            if len(results) < limit:
+                results = read_archived_tail(day, limit - len(results), table_name, self.data_dir) + results
+            if len(results) >= limit:
+                break
+
+        return results
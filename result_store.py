@@ -0,0 +1,204 @@
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from roulette_result import RouletteResult
+from result_journal import ResultJournal
+from spin_log import SpinLogWriter
+from background_writer import BackgroundResultWriter
+from config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    number INTEGER NOT NULL,
+    color TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    session_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_table_timestamp ON results (table_name, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_number ON results (number, timestamp);
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+def _format_timestamp(timestamp: datetime) -> str:
+    """Fixed-width ISO timestamp so text ordering matches time ordering"""
+    return timestamp.isoformat(timespec='microseconds')
+
+def _row_to_result(row) -> RouletteResult:
+    return RouletteResult(
+        number=row[0],
+        color=row[1],
+        timestamp=datetime.fromisoformat(row[2]),
+        table_name=row[3],
+        session_id=row[4]
+    )
+
+class ResultStore:
+    """SQLite-backed result store with WAL mode and indexed queries"""
+
+    def __init__(self, db_path: str = None, batch_size: int = None):
+        self.db_path = db_path or Config.RESULT_DB_PATH
+        self.batch_size = batch_size or Config.RESULT_DB_BATCH_SIZE
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._pending = []
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One connection shared across threads, serialized by our own lock
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def append(self, result: RouletteResult):
+        """Queue a result for insertion, writing once a full batch is pending"""
+        with self._lock:
+            self._pending.append(result)
+            if len(self._pending) >= self.batch_size:
+                self._write_pending()
+
+    def append_many(self, results: Iterable[RouletteResult]):
+        """Insert many results in a single transaction"""
+        with self._lock:
+            self._pending.extend(results)
+            self._write_pending()
+
+    def flush(self):
+        """Write any pending results"""
+        with self._lock:
+            self._write_pending()
+
+    def sync(self):
+        """Write pending results and checkpoint the WAL to stable storage"""
+        with self._lock:
+            self._write_pending()
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+
+        with self._conn:
+            self._insert(self._pending)
+        self._pending = []
+
+    def _insert(self, results: List[RouletteResult]):
+        self._conn.executemany(
+            "INSERT INTO results (number, color, timestamp, table_name, session_id) VALUES (?, ?, ?, ?, ?)",
+            [(r.number, r.color, _format_timestamp(r.timestamp), r.table_name, r.session_id) for r in results]
+        )
+
+    def import_batch(self, source: str, results: List[RouletteResult], position: int, complete: bool = False):
+        """Insert one bulk-import batch and record the source position it reached, atomically"""
+        with self._lock:
+            self._write_pending()
+            with self._conn:
+                self._insert(results)
+                self._conn.execute(
+                    "INSERT INTO imports (source, position, complete) VALUES (?, ?, ?) "
+                    "ON CONFLICT(source) DO UPDATE SET position = excluded.position, complete = excluded.complete",
+                    (source, position, int(complete))
+                )
+
+    def import_progress(self, source: str) -> Tuple[int, bool]:
+        """Get how many entries of a source were imported and whether it finished"""
+        rows = self._query("SELECT position, complete FROM imports WHERE source = ?", (source,))
+        if not rows:
+            return 0, False
+        return rows[0][0], bool(rows[0][1])
+
+    def recent(self, table_name: str, limit: int = 500) -> List[RouletteResult]:
+        """Get the newest results for a table, oldest first"""
+        rows = self._query(
+            "SELECT number, color, timestamp, table_name, session_id FROM results "
+            "WHERE table_name = ? ORDER BY timestamp DESC LIMIT ?",
+            (table_name, limit)
+        )
+        return [_row_to_result(row) for row in reversed(rows)]
+
+    def between(self, start: datetime, end: datetime, table_name: Optional[str] = None) -> List[RouletteResult]:
+        """Get results with start <= timestamp < end, optionally for one table"""
+        sql = ("SELECT number, color, timestamp, table_name, session_id FROM results "
+               "WHERE timestamp >= ? AND timestamp < ?")
+        params = [_format_timestamp(start), _format_timestamp(end)]
+
+        if table_name is not None:
+            sql += " AND table_name = ?"
+            params.append(table_name)
+
+        return [_row_to_result(row) for row in self._query(sql + " ORDER BY timestamp", params)]
+
+    def by_number(self, number: int, start: Optional[datetime] = None,
+                  end: Optional[datetime] = None, table_name: Optional[str] = None) -> List[RouletteResult]:
+        """Get every occurrence of a number, optionally within a time range and table"""
+        sql = "SELECT number, color, timestamp, table_name, session_id FROM results WHERE number = ?"
+        params = [number]
+
+        if start is not None:
+            sql += " AND timestamp >= ?"
+            params.append(_format_timestamp(start))
+        if end is not None:
+            sql += " AND timestamp < ?"
+            params.append(_format_timestamp(end))
+        if table_name is not None:
+            sql += " AND table_name = ?"
+            params.append(table_name)
+
+        return [_row_to_result(row) for row in self._query(sql + " ORDER BY timestamp", params)]
+
+    def count(self, table_name: Optional[str] = None) -> int:
+        """Count stored results, optionally for one table"""
+        if table_name is None:
+            rows = self._query("SELECT COUNT(*) FROM results", ())
+        else:
+            rows = self._query("SELECT COUNT(*) FROM results WHERE table_name = ?", (table_name,))
+        return rows[0][0]
+
+    def _query(self, sql: str, params) -> list:
+        with self._lock:
+            # Make our own pending writes visible to the query
+            self._write_pending()
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        """Write pending results and close the database"""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._write_pending()
+                self._conn.close()
+            except Exception as e:
+                self.logger.error(f"Error closing result store: {str(e)}")
+            self._conn = None
+
+def create_result_store():
+    """Create the result persistence backend selected in the configuration"""
+    backend = Config.RESULT_STORE_BACKEND.lower()
+
+    if backend == "sqlite":
+        store = ResultStore()
+    elif backend == "jsonl":
+        store = ResultJournal()
+    elif backend == "binary":
+        store = SpinLogWriter()
+    else:
+        raise ValueError(f"Unknown result store backend: {Config.RESULT_STORE_BACKEND}")
+
+    # Keep disk writes off the detection thread
+    if Config.PERSIST_ASYNC:
+        return BackgroundResultWriter(store)
+    return store
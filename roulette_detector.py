@@ -4,17 +4,18 @@ import cv2
 import numpy as np
 from PIL import Image
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
 from datetime import datetime
 from typing import Optional, Tuple
 import re
 import io
 
 from roulette_result import RouletteResult, get_color_for_number
+from dedupe_state import DedupeState
+from detection_budget import DetectionBudget, CycleStats
+from page_observer import PageObserver, entry_timestamp
+from selector_stats import SelectorStats, HIT, SEEN, MISS
 from config import Config
 
 # Try to import pytesseract, but make it optional
@@ -33,6 +34,11 @@ class RouletteDetector:
         self.driver = None
         self.last_result = None
         self.result_history = []
+        self.cycle_stats = CycleStats()
+        self.selector_stats = SelectorStats()
+        self.observer = None
+        self.push_wait = 0.0
+        self.dedupe = DedupeState()
         self.session_start_time = None
         
         # OCR configuration
@@ -80,14 +86,24 @@ class RouletteDetector:
             return False
     
     def detect_result(self) -> Optional[RouletteResult]:
-        """Detect the current roulette result"""
+        """Detect the current roulette result; the cycle's duration is recorded"""
+        start = time.monotonic()
+        self.push_wait = 0.0
+        try:
+            return self._detect_cycle()
+        finally:
+            self.cycle_stats.record(time.monotonic() - start, self.push_wait)
+    
+    def _detect_cycle(self) -> Optional[RouletteResult]:
+        """One detection pass"""
         try:
             # Try multiple detection methods
             result = self._detect_via_dom()
             if result:
                 return result
             
-            if self.ocr_enabled:
+            # Push mode already waited on the page; OCR would only burn CPU between spins
+            if self.ocr_enabled and Config.DOM_DETECTION_MODE != "push":
                 result = self._detect_via_ocr()
                 if result:
                     return result
@@ -101,9 +117,6 @@ class RouletteDetector:
     def _detect_via_dom(self) -> Optional[RouletteResult]:
         """Detect result via DOM elements"""
         try:
-            # Wait for game elements to load
-            wait = WebDriverWait(self.driver, 10)
-            
             # Look for result elements in the DOM
             selectors = [
                 ".result-number",
@@ -119,9 +132,15 @@ class RouletteDetector:
                 ".previous-result"
             ]
             
-            for selector in selectors:
+            if Config.DOM_DETECTION_MODE == "push":
+                return self._detect_via_observer(selectors)
+            
+            # Proven selectors first; ones that never match are only rescanned now and then
+            selectors = self.selector_stats.ranked(selectors)
+            
+            # One deadline for the whole cycle: missing selectors are not waited on
+            for selector, element in DetectionBudget().scan(self.driver, selectors, self.selector_stats):
                 try:
-                    element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
                     text = element.text.strip()
                     
                     if text and self._is_valid_number(text):
@@ -137,10 +156,19 @@ class RouletteDetector:
                         )
                         
                         if self._is_new_result(result):
-                            self.logger.info(f"Result detected via DOM: {number} ({color})")
+                            self.selector_stats.record(selector, HIT)
+                            self.logger.info(f"Result detected via DOM ({selector}): {number} ({color})")
                             return result
+                        
+                        # A trusted selector still showing the last result means there is nothing new
+                        self.selector_stats.record(selector, SEEN)
+                        if self.selector_stats.settled(selector):
+                            return None
+                    else:
+                        self.selector_stats.record(selector, MISS)
                             
-                except (TimeoutException, NoSuchElementException):
+                except (NoSuchElementException, StaleElementReferenceException):
+                    self.selector_stats.record(selector, MISS)
                     continue
             
             return None
@@ -208,6 +236,32 @@ class RouletteDetector:
         
         return regions
     
+    def _detect_via_observer(self, selectors: list) -> Optional[RouletteResult]:
+        """Take the next result pushed by the in-page observer, waiting up to PUSH_WAIT_MS for one"""
+        if self.observer is None or self.observer.driver is not self.driver:
+            self.observer = PageObserver(self.driver, selectors)
+        
+        entry = self.observer.next_entry()
+        self.push_wait = self.observer.waited
+        while entry:
+            number = entry["number"]
+            color = get_color_for_number(number)
+            
+            result = RouletteResult(
+                number=number,
+                color=color,
+                timestamp=entry_timestamp(entry),
+                table_name=Config.TABLE_NAME,
+                session_id=self._get_session_id()
+            )
+            
+            if self._is_new_result(result):
+                self.logger.info(f"Result detected via observer ({entry['selector']}): {number} ({color})")
+                return result
+            entry = self.observer.next_entry(wait=False)
+        
+        return None
+    
     def _is_valid_number(self, text: str) -> bool:
         """Check if text represents a valid roulette number"""
         try:
@@ -218,15 +272,8 @@ class RouletteDetector:
     
     def _is_new_result(self, result: RouletteResult) -> bool:
         """Check if this is a new result (not duplicate)"""
-        if not self.last_result:
-            return True
-        
-        # Check if it's the same number and within a short time window
-        if (result.number == self.last_result.number and 
-            (result.timestamp - self.last_result.timestamp).seconds < 30):
-            return False
-        
-        return True
+        # Checked against persisted state, so a restart doesn't re-emit the last result
+        return not self.dedupe.is_duplicate(result)
     
     def _get_session_id(self) -> str:
         """Generate a session ID for tracking"""
@@ -237,12 +284,19 @@ class RouletteDetector:
     def update_result_history(self, result: RouletteResult):
         """Update the result history"""
         self.last_result = result
+        self.dedupe.record(result)
         self.result_history.append(result)
         
         # Keep only the last N results
         if len(self.result_history) > Config.RESULT_HISTORY_SIZE:
             self.result_history.pop(0)
     
+    def preload_history(self, results: list):
+        """Pre-fill the result history from persisted results, oldest first"""
+        self.result_history = list(results[-Config.RESULT_HISTORY_SIZE:])
+        if self.result_history:
+            self.last_result = self.result_history[-1]
+    
     def is_session_expired(self) -> bool:
         """Check if the session has expired (2 hours)"""
         if not self.session_start_time:
@@ -255,6 +309,9 @@ class RouletteDetector:
         """Refresh the session by reloading the page"""
         try:
             self.driver.refresh()
+            # The reload dropped the in-page observer
+            if self.observer:
+                self.observer.arm()
             self.session_start_time = datetime.now()
             self.logger.info("Session refreshed successfully")
             return True
@@ -264,6 +321,8 @@ class RouletteDetector:
     
     def close(self):
         """Close the browser"""
+        self.dedupe.save()
+        self.selector_stats.save()
         if self.driver:
             try:
                 self.driver.quit()
@@ -279,5 +338,7 @@ class RouletteDetector:
             "session_expired": self.is_session_expired(),
             "last_result": self.last_result.to_dict() if self.last_result else None,
             "result_count": len(self.result_history),
-            "ocr_enabled": self.ocr_enabled
+            "ocr_enabled": self.ocr_enabled,
+            "cycle": self.cycle_stats.get_status(),
+            "selectors": self.selector_stats.get_status()
         }
@@ -2,16 +2,16 @@ import time
 import logging
 import random
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
 from datetime import datetime
 from typing import Optional
 
 from roulette_result import RouletteResult, get_color_for_number
+from dedupe_state import DedupeState
+from detection_budget import DetectionBudget, CycleStats
+from page_observer import PageObserver, entry_timestamp
 from config import Config
 
 class RouletteDetectorStealth:
@@ -22,6 +22,10 @@ class RouletteDetectorStealth:
         self.driver = None
         self.last_result = None
         self.result_history = []
+        self.cycle_stats = CycleStats()
+        self.observer = None
+        self.push_wait = 0.0
+        self.dedupe = DedupeState()
         self.session_start_time = None
     
     def initialize_browser(self) -> bool:
@@ -205,7 +209,16 @@ class RouletteDetectorStealth:
             self.logger.debug(f"Human behavior simulation failed: {str(e)}")
     
     def detect_result(self) -> Optional[RouletteResult]:
-        """Detect the current roulette result"""
+        """Detect the current roulette result; the cycle's duration is recorded"""
+        start = time.monotonic()
+        self.push_wait = 0.0
+        try:
+            return self._detect_cycle()
+        finally:
+            self.cycle_stats.record(time.monotonic() - start, self.push_wait)
+    
+    def _detect_cycle(self) -> Optional[RouletteResult]:
+        """One detection pass"""
         try:
             # Check if we're still blocked
             if self._is_blocked():
@@ -223,9 +236,6 @@ class RouletteDetectorStealth:
     def _detect_via_dom(self) -> Optional[RouletteResult]:
         """Detect result via DOM elements"""
         try:
-            # Wait for game elements to load
-            wait = WebDriverWait(self.driver, 15)
-            
             # Expanded list of selectors for better detection
             selectors = [
                 ".result-number",
@@ -255,9 +265,12 @@ class RouletteDetectorStealth:
                 ".number-display-result"
             ]
             
-            for selector in selectors:
+            if Config.DOM_DETECTION_MODE == "push":
+                return self._detect_via_observer(selectors)
+            
+            # One deadline for the whole cycle: missing selectors are not waited on
+            for selector, element in DetectionBudget().scan(self.driver, selectors):
                 try:
-                    element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
                     text = element.text.strip()
                     
                     if text and self._is_valid_number(text):
@@ -276,7 +289,7 @@ class RouletteDetectorStealth:
                             self.logger.info(f"Result detected via DOM: {number} ({color})")
                             return result
                             
-                except (TimeoutException, NoSuchElementException):
+                except (NoSuchElementException, StaleElementReferenceException):
                     continue
             
             return None
@@ -285,6 +298,32 @@ class RouletteDetectorStealth:
             self.logger.debug(f"DOM detection failed: {str(e)}")
             return None
     
+    def _detect_via_observer(self, selectors: list) -> Optional[RouletteResult]:
+        """Take the next result pushed by the in-page observer, waiting up to PUSH_WAIT_MS for one"""
+        if self.observer is None or self.observer.driver is not self.driver:
+            self.observer = PageObserver(self.driver, selectors)
+        
+        entry = self.observer.next_entry()
+        self.push_wait = self.observer.waited
+        while entry:
+            number = entry["number"]
+            color = get_color_for_number(number)
+            
+            result = RouletteResult(
+                number=number,
+                color=color,
+                timestamp=entry_timestamp(entry),
+                table_name=Config.TABLE_NAME,
+                session_id=self._get_session_id()
+            )
+            
+            if self._is_new_result(result):
+                self.logger.info(f"Result detected via observer ({entry['selector']}): {number} ({color})")
+                return result
+            entry = self.observer.next_entry(wait=False)
+        
+        return None
+    
     def _is_valid_number(self, text: str) -> bool:
         """Check if text represents a valid roulette number"""
         try:
@@ -295,15 +334,8 @@ class RouletteDetectorStealth:
     
     def _is_new_result(self, result: RouletteResult) -> bool:
         """Check if this is a new result (not duplicate)"""
-        if not self.last_result:
-            return True
-        
-        # Check if it's the same number and within a short time window
-        if (result.number == self.last_result.number and 
-            (result.timestamp - self.last_result.timestamp).seconds < 30):
-            return False
-        
-        return True
+        # Checked against persisted state, so a restart doesn't re-emit the last result
+        return not self.dedupe.is_duplicate(result)
     
     def _get_session_id(self) -> str:
         """Generate a session ID for tracking"""
@@ -314,12 +346,19 @@ class RouletteDetectorStealth:
     def update_result_history(self, result: RouletteResult):
         """Update the result history"""
         self.last_result = result
+        self.dedupe.record(result)
         self.result_history.append(result)
         
         # Keep only the last N results
         if len(self.result_history) > Config.RESULT_HISTORY_SIZE:
             self.result_history.pop(0)
     
+    def preload_history(self, results: list):
+        """Pre-fill the result history from persisted results, oldest first"""
+        self.result_history = list(results[-Config.RESULT_HISTORY_SIZE:])
+        if self.result_history:
+            self.last_result = self.result_history[-1]
+    
     def is_session_expired(self) -> bool:
         """Check if the session has expired (2 hours)"""
         if not self.session_start_time:
@@ -333,6 +372,9 @@ class RouletteDetectorStealth:
         try:
             self.driver.refresh()
             time.sleep(random.uniform(3, 7))
+            # The reload dropped the in-page observer
+            if self.observer:
+                self.observer.arm()
             self.session_start_time = datetime.now()
             self.logger.info("Session refreshed successfully")
             return True
@@ -342,6 +384,7 @@ class RouletteDetectorStealth:
     
     def close(self):
         """Close the browser"""
+        self.dedupe.save()
         if self.driver:
             try:
                 self.driver.quit()
@@ -358,5 +401,6 @@ class RouletteDetectorStealth:
             "last_result": self.last_result.to_dict() if self.last_result else None,
             "result_count": len(self.result_history),
             "ocr_enabled": False,
+            "cycle": self.cycle_stats.get_status(),
             "stealth_mode": True
         }
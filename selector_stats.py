@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import List
+
+from config import Config
+
+# Outcomes of trying a selector in one detection cycle
+HIT = "hit"    # produced a new result
+SEEN = "seen"  # showed a valid number that was already emitted
+MISS = "miss"  # absent, or nothing that parses as a number
+
+class SelectorStats:
+    """Per-table hit/miss/latency counts for detection selectors, so proven selectors are tried first"""
+
+    def __init__(self, table_name: str = None, path: str = None, cold_after: int = None,
+                 rescan_cycles: int = None, save_interval: float = 60):
+        self.table_name = table_name or Config.TABLE_NAME
+        self.path = path or Config.SELECTOR_STATS_FILE
+        self.cold_after = cold_after or Config.SELECTOR_COLD_AFTER
+        self.rescan_cycles = rescan_cycles or Config.SELECTOR_RESCAN_CYCLES
+        self.save_interval = save_interval
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._tables = {}
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self.cycles = 0
+        self.rescanning = False
+        self._load()
+        self._stats = self._tables.setdefault(self.table_name, {})
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._tables = json.load(f).get("tables", {})
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            self.logger.warning(f"Ignoring unreadable selector stats {self.path}: {str(e)}")
+
+    def save(self):
+        """Write the stats if anything changed since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"tables": self._tables}, separators=(',', ':'))
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"Error saving selector stats: {str(e)}")
+
+    def _entry(self, selector: str) -> dict:
+        entry = self._stats.get(selector)
+        if entry is None:
+            entry = {"hits": 0, "seen": 0, "misses": 0, "streak": 0, "score": 0.0, "lookups": 0, "lookup_ms": 0.0}
+            self._stats[selector] = entry
+        return entry
+
+    def _is_cold(self, selector: str) -> bool:
+        entry = self._stats.get(selector)
+        return entry is not None and entry["streak"] >= self.cold_after
+
+    def ranked(self, selectors: List[str]) -> List[str]:
+        """Selectors to try this cycle, best first; cold selectors only join on every Nth cycle"""
+        self.cycles += 1
+        self.rescanning = False
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+        position = {selector: i for i, selector in enumerate(selectors)}
+        with self._lock:
+            def rank(selector):
+                entry = self._stats.get(selector)
+                if entry is None:
+                    return (0.0, 0, position[selector])
+                return (-entry["score"], -entry["hits"], position[selector])
+
+            ordered = sorted(selectors, key=rank)
+            active = [selector for selector in ordered if not self._is_cold(selector)]
+
+        # Cold selectors get a full pass every Nth cycle, in case the layout changed under us
+        if len(active) < len(ordered) and self.cycles % self.rescan_cycles == 0:
+            self.rescanning = True
+            return ordered
+
+        # Everything has gone cold: look everywhere
+        return active or ordered
+
+    def settled(self, selector: str) -> bool:
+        """True if an already-emitted number from this selector means the page hasn't moved on"""
+        if self.rescanning:
+            return False
+        with self._lock:
+            entry = self._stats.get(selector)
+            return entry is not None and entry["hits"] > 0 and entry["score"] >= 0.5
+
+    def record(self, selector: str, outcome: str):
+        """Record how a selector did this cycle"""
+        with self._lock:
+            entry = self._entry(selector)
+            if outcome == HIT:
+                entry["hits"] += 1
+            elif outcome == SEEN:
+                entry["seen"] += 1
+            else:
+                entry["misses"] += 1
+
+            # Recent behaviour counts most, so a layout change re-ranks within a few cycles
+            success = 0.0 if outcome == MISS else 1.0
+            entry["score"] = round(entry["score"] * 0.8 + success * 0.2, 4)
+            entry["streak"] = entry["streak"] + 1 if outcome == MISS else 0
+            self._dirty = True
+
+    def lookup(self, selector: str, seconds: float):
+        """Record the time one lookup of a selector took"""
+        with self._lock:
+            entry = self._entry(selector)
+            entry["lookups"] += 1
+            entry["lookup_ms"] = round(entry["lookup_ms"] + seconds * 1000, 3)
+            self._dirty = True
+
+    def get_status(self) -> dict:
+        with self._lock:
+            best = sorted(self._stats.items(), key=lambda item: (-item[1]["score"], -item[1]["hits"]))[:3]
+            return {
+                "cycles": self.cycles,
+                "tracked": len(self._stats),
+                "cold": sum(1 for selector in self._stats if self._is_cold(selector)),
+                "best": [
+                    {
+                        "selector": selector,
+                        "hits": entry["hits"],
+                        "score": entry["score"],
+                        "avg_lookup_ms": round(entry["lookup_ms"] / entry["lookups"], 2) if entry["lookups"] else None
+                    }
+                    for selector, entry in best
+                ]
+            }
@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import struct
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from roulette_result import RouletteResult, get_color_for_number
+from config import Config
+
+# File layout: 16 byte header followed by fixed-width little-endian records
+MAGIC = b"RSPINLOG"
+VERSION = 1
+HEADER = struct.Struct("<8sHH4x")
+RECORD = struct.Struct("<qHB")
+
+# Matches RECORD byte for byte, so the file can be mapped straight into arrays
+SPIN_DTYPE = np.dtype([
+    ("timestamp_ms", "<i8"),
+    ("table_id", "<u2"),
+    ("number", "u1")
+])
+
+def spin_log_path(day: date, data_dir: str = None) -> str:
+    """Get the binary spin log path for a given day"""
+    return os.path.join(data_dir or Config.DATA_DIR, f"spins_{day.strftime('%Y%m%d')}.bin")
+
+def to_epoch_ms(timestamp: datetime) -> int:
+    """Convert a datetime to epoch milliseconds"""
+    return int(round(timestamp.timestamp() * 1000))
+
+class TableRegistry:
+    """Maps table names to the uint16 ids stored in spin logs"""
+
+    def __init__(self, data_dir: str = None):
+        self.path = os.path.join(data_dir or Config.DATA_DIR, "spin_tables.json")
+        self._lock = threading.Lock()
+        self._names = []
+        self._ids = {}
+        self.reload()
+
+    def reload(self):
+        """Reload the registry from disk"""
+        with self._lock:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._names = json.load(f)["tables"]
+        except FileNotFoundError:
+            self._names = []
+        self._ids = {name: i for i, name in enumerate(self._names)}
+
+    @contextmanager
+    def _file_lock(self, timeout: float = 10):
+        """Exclusive lock shared by every process writing this registry"""
+        lock_path = self.path + ".lock"
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    # A lock this old was left by a writer that died holding it
+                    if time.time() - os.path.getmtime(lock_path) > timeout:
+                        os.remove(lock_path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for {lock_path}")
+                time.sleep(0.01)
+
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+    def get_id(self, table_name: str) -> int:
+        """Get the id for a table, registering it if it is new"""
+        with self._lock:
+            table_id = self._ids.get(table_name)
+            if table_id is not None:
+                return table_id
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self._file_lock():
+                # Another collector sharing DATA_DIR may have registered tables since we loaded
+                self._load()
+                table_id = self._ids.get(table_name)
+                if table_id is not None:
+                    return table_id
+
+                if len(self._names) > 0xFFFF:
+                    raise ValueError("Spin log table registry is full")
+
+                table_id = len(self._names)
+                self._names.append(table_name)
+                self._ids[table_name] = table_id
+
+                tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"tables": self._names}, f)
+                os.replace(tmp_path, self.path)
+                return table_id
+
+    def lookup(self, table_name: str) -> Optional[int]:
+        """Get the id for a table without registering it; None if no log has recorded it"""
+        with self._lock:
+            table_id = self._ids.get(table_name)
+        if table_id is None:
+            # Another writer may have registered it since we loaded
+            self.reload()
+            with self._lock:
+                table_id = self._ids.get(table_name)
+        return table_id
+
+    def get_name(self, table_id: int) -> str:
+        """Get the table name for an id"""
+        if table_id >= len(self._names):
+            self.reload()
+        return self._names[table_id]
+
+class SpinLogWriter:
+    """Appends results to daily fixed-width binary spin logs"""
+
+    def __init__(self, data_dir: str = None):
+        self.data_dir = data_dir or Config.DATA_DIR
+        self.logger = logging.getLogger(__name__)
+        self.tables = TableRegistry(self.data_dir)
+        self._lock = threading.Lock()
+        self._file = None
+        self._day = None
+
+    def append(self, result: RouletteResult):
+        """Append one result record"""
+        self.append_many([result])
+
+    def append_many(self, results: Iterable[RouletteResult]):
+        """Append several result records with one write per day file"""
+        with self._lock:
+            chunks = {}
+            for result in results:
+                record = RECORD.pack(
+                    to_epoch_ms(result.timestamp),
+                    self.tables.get_id(result.table_name),
+                    result.number
+                )
+                chunks.setdefault(result.timestamp.date(), []).append(record)
+
+            for day, records in chunks.items():
+                f = self._get_file(day)
+                f.write(b"".join(records))
+                f.flush()
+
+    def _get_file(self, day: date):
+        """Get the open log file for a day, rolling over when the day changes"""
+        if self._file is None or day != self._day:
+            self._close_file()
+            os.makedirs(self.data_dir, exist_ok=True)
+
+            path = spin_log_path(day, self.data_dir)
+            self._file = open(path, 'ab')
+            if self._file.tell() == 0:
+                self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            else:
+                self._truncate_partial_record(path)
+            self._day = day
+
+        return self._file
+
+    def _truncate_partial_record(self, path: str):
+        """Drop a record left half-written by a crash so later records stay aligned"""
+        size = os.path.getsize(path)
+        excess = (size - HEADER.size) % RECORD.size
+        if excess:
+            self.logger.warning(f"Dropping {excess} trailing bytes of a partial record in {path}")
+            self._file.truncate(size - excess)
+            self._file.seek(0, os.SEEK_END)
+
+    def flush(self):
+        """Flush written records to the operating system"""
+        with self._lock:
+            if self._file:
+                self._file.flush()
+
+    def recent(self, table_name: str, limit: int, lookback_days: int = None) -> List[RouletteResult]:
+        """Get the newest results for a table from the mapped tails of recent logs"""
+        # Imported here because result_archive builds on this module
+        from result_archive import read_archived_tail
+
+        lookback_days = lookback_days if lookback_days is not None else Config.WARM_START_LOOKBACK_DAYS
+        if limit <= 0:
+            return []
+        self.flush()
+
+        table_id = self.tables.lookup(table_name)
+        today = datetime.now().date()
+        results = []
+
+        for days_ago in range(lookback_days + 1):
+            day = today - timedelta(days=days_ago)
+            path = spin_log_path(day, self.data_dir)
+            if table_id is not None and os.path.exists(path):
+                log = SpinLog(path)
+                matches = np.nonzero(log.table_ids == table_id)[0][-(limit - len(results)):]
+                results = list(log.iter_results(self.tables, indices=matches)) + results
+            # Days without a spin log may still have an archive or a legacy array
+            if len(results) < limit:
+                results = read_archived_tail(day, limit - len(results), table_name, self.data_dir) + results
+            if len(results) >= limit:
+                break
+
+        return results
+
+    def sync(self):
+        """Flush and fsync the current log file to stable storage"""
+        with self._lock:
+            if self._file:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the current log file"""
+        with self._lock:
+            self._close_file()
+
+    def _close_file(self):
+        if self._file:
+            try:
+                self._file.close()
+            except Exception as e:
+                self.logger.error(f"Error closing spin log: {str(e)}")
+            self._file = None
+            self._day = None
+
+class SpinLog:
+    """Read-only, memory-mapped view of one binary spin log"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with open(path, 'rb') as f:
+            magic, version, record_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or record_size != SPIN_DTYPE.itemsize:
+            raise ValueError(f"Not a spin log: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported spin log version {version}: {path}")
+
+        # A trailing partial record from a crash is simply left out of the view
+        count = (os.path.getsize(path) - HEADER.size) // SPIN_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=SPIN_DTYPE, mode='r', offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=SPIN_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def numbers(self) -> np.ndarray:
+        return self.records["number"]
+
+    @property
+    def timestamps_ms(self) -> np.ndarray:
+        return self.records["timestamp_ms"]
+
+    @property
+    def table_ids(self) -> np.ndarray:
+        return self.records["table_id"]
+
+    def iter_results(self, tables: TableRegistry, session_id: Optional[str] = None,
+                     indices: Optional[np.ndarray] = None) -> Iterator[RouletteResult]:
+        """Expand records (or the records at the given indices) back into RouletteResult objects"""
+        records = self.records if indices is None else self.records[indices]
+        for timestamp_ms, table_id, number in records.tolist():
+            yield RouletteResult(
+                number=number,
+                color=get_color_for_number(number),
+                timestamp=datetime.fromtimestamp(timestamp_ms / 1000),
+                table_name=tables.get_name(table_id),
+                session_id=session_id
+            )
+
+def open_spin_logs(start_day: date, end_day: date, data_dir: str = None) -> List[SpinLog]:
+    """Map every spin log between two days (inclusive) that exists on disk"""
+    logs = []
+    day = start_day
+    while day <= end_day:
+        path = spin_log_path(day, data_dir)
+        if os.path.exists(path):
+            logs.append(SpinLog(path))
+        day += timedelta(days=1)
+    return logs
+
+def load_spin_history(start_day: date, end_day: date, data_dir: str = None) -> np.ndarray:
+    """Load a multi-day history as one structured array"""
+    logs = open_spin_logs(start_day, end_day, data_dir)
+    if not logs:
+        return np.empty(0, dtype=SPIN_DTYPE)
+    if len(logs) == 1:
+        return logs[0].records
+
+    # Joining days needs one copy; single days stay zero-copy
+    return np.concatenate([log.records for log in logs])
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the DevTools backend against a local headless Chrome and a fixture page
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+from cdp_client import CDPClient, CDPResultStream, CDP_AVAILABLE, find_page_target
+from http_transport import get_session
+
+DEBUG_PORT = 9229
+
+# A stand-in for the game: the winning number changes every second
+FIXTURE_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Roulette Fixture</title></head>
+<body>
+<div class="result-number">0</div>
+<script>
+let spin = 0;
+setInterval(() => {
+    spin += 1;
+    document.querySelector('.result-number').textContent = String((spin * 7) % 37);
+}, 1000);
+</script>
+</body>
+</html>
+"""
+
+def _find_chrome():
+    for name in (os.getenv("CHROME_BINARY"), "google-chrome", "chromium", "chromium-browser", "chrome"):
+        if name and shutil.which(name):
+            return shutil.which(name)
+    return None
+
+def _wait_for_debug_port(timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if get_session().get(f"http://localhost:{DEBUG_PORT}/json/version", timeout=1).status_code == 200:
+                return True
+        except Exception:
+            pass
+        time.sleep(0.25)
+    return False
+
+def _collect(stream, count, timeout=10):
+    entries = []
+    deadline = time.time() + timeout
+    while len(entries) < count and time.time() < deadline:
+        entry = stream.next_entry()
+        if entry:
+            entries.append(entry)
+    return entries
+
+def check_cdp_backend():
+    """Test the DevTools backend"""
+    print("Testing DevTools backend...")
+
+    if not CDP_AVAILABLE:
+        print("❌ websocket-client is not installed")
+        return False
+
+    chrome = _find_chrome()
+    if not chrome:
+        print("❌ Chrome not found (set CHROME_BINARY)")
+        return False
+
+    workdir = tempfile.mkdtemp(prefix="cdp_fixture_")
+    fixture_path = os.path.join(workdir, "fixture.html")
+    with open(fixture_path, 'w', encoding='utf-8') as f:
+        f.write(FIXTURE_PAGE)
+
+    process = subprocess.Popen([
+        chrome,
+        "--headless=new",
+        f"--remote-debugging-port={DEBUG_PORT}",
+        f"--user-data-dir={os.path.join(workdir, 'profile')}",
+        "--no-first-run",
+        "--no-sandbox",
+        f"file://{fixture_path}"
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    client = None
+    success = True
+
+    try:
+        if not _wait_for_debug_port():
+            print("❌ Chrome debug port did not come up")
+            return False
+
+        target = find_page_target(DEBUG_PORT, ("fixture",))
+        client = CDPClient(target["webSocketDebuggerUrl"])
+        client.connect()
+        print("✅ Connected to DevTools")
+
+        # Test pushed results
+        print("Waiting for pushed results...")
+        stream = CDPResultStream(client, [".result-number"], wait_ms=2000)
+        entries = _collect(stream, 3)
+        if len(entries) == 3:
+            print(f"✅ Received results: {[entry['number'] for entry in entries]}")
+        else:
+            print(f"❌ Received {len(entries)} of 3 results")
+            success = False
+
+        # Test script evaluation
+        title = client.evaluate("document.title")
+        if title == "Roulette Fixture":
+            print("✅ Script evaluation works")
+        else:
+            print(f"❌ Unexpected page title: {title}")
+            success = False
+
+        # Test screenshots
+        if client.screenshot().startswith(b"\x89PNG"):
+            print("✅ Screenshot captured")
+        else:
+            print("❌ Screenshot is not a PNG")
+            success = False
+
+        # Test that the observer re-arms after a reload
+        print("Reloading page...")
+        client.send("Page.reload")
+        entries = _collect(stream, 2)
+        if len(entries) == 2:
+            print("✅ Results keep arriving after reload")
+        else:
+            print(f"❌ Received {len(entries)} of 2 results after reload")
+            success = False
+
+        print("\nDevTools backend test completed!")
+
+    except Exception as e:
+        print(f"❌ Error during DevTools test: {str(e)}")
+        return False
+
+    finally:
+        if client:
+            client.close()
+        process.terminate()
+        process.wait(timeout=10)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return success
+
+def test_cdp_backend():
+    """Run the check under pytest, skipping where Chrome or websocket-client is missing"""
+    import pytest
+
+    if not CDP_AVAILABLE:
+        pytest.skip("websocket-client is not installed")
+    if not _find_chrome():
+        pytest.skip("Chrome not found (set CHROME_BINARY)")
+    assert check_cdp_backend()
+
+if __name__ == "__main__":
+    success = check_cdp_backend()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming legacy importer
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+from import_results import iter_json_array, import_legacy_results
+from result_journal import journal_path, read_journal
+from datetime import date
+
+def _write(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+def test_scalars_across_chunk_boundaries():
+    """Numbers and literals split by a chunk boundary must come back whole"""
+    values = [1, 23, 456, -7.5, 1e3, True, False, None, "a,b]", {"n": [1, 2]}, 36]
+    text = json.dumps(values)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write(directory, "array.json", text)
+        for chunk_size in range(1, len(text) + 2):
+            assert list(iter_json_array(path, chunk_size=chunk_size)) == values, chunk_size
+
+        # Multi-digit numbers split across chunk boundaries: [1,23,456] read three characters at a time
+        path = _write(directory, "small.json", "[1,23,456]")
+        assert list(iter_json_array(path, chunk_size=3)) == [1, 23, 456]
+
+def test_import_into_journal():
+    """The default jsonl backend receives the legacy results"""
+    entries = [
+        {"number": 0, "color": "green", "timestamp": "2024-01-15T10:00:00", "table_name": "T", "session_id": "s"},
+        {"number": 15, "color": "black", "timestamp": "2024-01-15T10:01:00", "table_name": "T", "session_id": "s"},
+        {"number": 15, "color": "red", "timestamp": "2024-01-15T10:02:00", "table_name": "T", "session_id": "s"}
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy = _write(directory, "results_20240115.json", json.dumps(entries, indent=2))
+        stats = import_legacy_results(data_dir=directory, batch_size=1, backend="jsonl")
+
+        assert stats[0]["imported"] == 2 and stats[0]["invalid"] == 1
+        numbers = [result.number for result in read_journal(journal_path(date(2024, 1, 15), directory))]
+        assert numbers == [0, 15]
+
+        # The legacy file is set aside so the day isn't read twice
+        assert not os.path.exists(legacy) and os.path.exists(legacy + ".imported")
+
+if __name__ == "__main__":
+    for test in (test_scalars_across_chunk_boundaries, test_import_into_journal):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            sys.exit(1)
+    sys.exit(0)
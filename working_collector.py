@@ -8,7 +8,6 @@ import time
 import logging
 import signal
 import sys
-import json
 from datetime import datetime
 from typing import Optional
 from selenium import webdriver
@@ -19,25 +18,40 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+from dedupe_state import DedupeState
+from dom_sweep import sweep_selectors, iter_candidates
+from page_observer import PageObserver, entry_timestamp
+from selector_stats import SelectorStats, HIT, SEEN, MISS
 from config import Config
-from discord_notifier import DiscordNotifier
+from notification_router import NotificationRouter
 from local_html_client import LocalHTMLClient
+from feed_server import ResultFeedServer
+from health_monitor import get_health_monitor, probe_webdriver
+from result_store import create_result_store
 from roulette_result import RouletteResult, get_color_for_number
 
 class WorkingRouletteCollector:
     """Working collector that actually connects to browser and detects results"""
     
     def __init__(self):
-        self.discord = DiscordNotifier()
+        self.discord = NotificationRouter()
         self.local_html = LocalHTMLClient()
+        self.feed = ResultFeedServer()
+        self.health = get_health_monitor()
+        self.store = create_result_store()
         self.logger = self._setup_logging()
         self.driver = None
         self.running = False
         self.last_result = None
+        self.dedupe = DedupeState()
+        self._detected_round_id = None
+        self.observer = None
+        self.push_wait = 0.0
+        self.selector_stats = SelectorStats()
         self.stats = {
             "results_collected": 0,
-            "discord_sent": 0,
-            "local_html_sent": 0,
+            "discord_queued": 0,
+            "local_html_queued": 0,
             "errors": 0,
             "start_time": None
         }
@@ -124,6 +138,7 @@ class WorkingRouletteCollector:
             return False
     
     def detect_result(self) -> Optional[RouletteResult]:
+        self.push_wait = 0.0
         try:
             if not self.driver:
                 return None
@@ -178,10 +193,21 @@ class WorkingRouletteCollector:
                 ".displayed-number", ".game-number-display", ".result-number-text"
             ]
             
+            if Config.DOM_DETECTION_MODE == "push":
+                return self._detect_via_observer(selectors)
+            
+            # Proven selectors first; ones that never match are only rescanned now and then
+            selectors = self.selector_stats.ranked(selectors)
+            
+            if Config.DOM_DETECTION_MODE == "sweep":
+                return self._detect_via_sweep(selectors)
+            
             for selector in selectors:
+                outcome = MISS
                 try:
-                    # Wait a bit for elements to be present
+                    start = time.monotonic()
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    self.selector_stats.lookup(selector, time.monotonic() - start)
                     
                     for element in elements:
                         try:
@@ -200,8 +226,10 @@ class WorkingRouletteCollector:
                                 )
                                 
                                 if self._is_new_result(result):
+                                    self.selector_stats.record(selector, HIT)
                                     self.logger.info(f"Result detected via {selector}: {number} ({color})")
                                     return result
+                                outcome = SEEN
                                     
                         except Exception as e:
                             self.logger.debug(f"Error processing element with selector {selector}: {str(e)}")
@@ -209,7 +237,12 @@ class WorkingRouletteCollector:
                             
                 except Exception as e:
                     self.logger.debug(f"Error with selector {selector}: {str(e)}")
-                    continue
+                
+                self.selector_stats.record(selector, outcome)
+                
+                # A trusted selector still showing the last result means there is nothing new
+                if outcome == SEEN and self.selector_stats.settled(selector):
+                    return None
             
             return None
             
@@ -217,6 +250,67 @@ class WorkingRouletteCollector:
             self.logger.error(f"Error detecting result: {str(e)}")
             return None
     
+    def _detect_via_sweep(self, selectors: list) -> Optional[RouletteResult]:
+        """Detect result by running every selector in a single script round trip"""
+        candidates = list(iter_candidates(sweep_selectors(self.driver, selectors)))
+        matched = {selector for selector, _, _ in candidates}
+        for selector in selectors:
+            if selector not in matched:
+                self.selector_stats.record(selector, MISS)
+        
+        for selector, number, round_id in candidates:
+            color = get_color_for_number(number)
+            
+            result = RouletteResult(
+                number=number,
+                color=color,
+                timestamp=datetime.now(),
+                table_name=Config.TABLE_NAME,
+                session_id=self._get_session_id()
+            )
+            
+            if self._is_new_result(result, round_id):
+                self.selector_stats.record(selector, HIT)
+                self._detected_round_id = round_id
+                self.logger.info(f"Result detected via sweep ({selector}): {number} ({color})")
+                return result
+            
+            # A trusted selector still showing the last result means there is nothing new
+            if selector in matched:
+                matched.discard(selector)
+                self.selector_stats.record(selector, SEEN)
+                if self.selector_stats.settled(selector):
+                    return None
+        
+        return None
+    
+    def _detect_via_observer(self, selectors: list) -> Optional[RouletteResult]:
+        """Take the next result pushed by the in-page observer, waiting up to PUSH_WAIT_MS for one"""
+        if self.observer is None or self.observer.driver is not self.driver:
+            self.observer = PageObserver(self.driver, selectors)
+        
+        entry = self.observer.next_entry()
+        self.push_wait = self.observer.waited
+        while entry:
+            number = entry["number"]
+            color = get_color_for_number(number)
+            
+            result = RouletteResult(
+                number=number,
+                color=color,
+                timestamp=entry_timestamp(entry),
+                table_name=Config.TABLE_NAME,
+                session_id=self._get_session_id()
+            )
+            
+            if self._is_new_result(result, entry.get("roundId")):
+                self._detected_round_id = entry.get("roundId")
+                self.logger.info(f"Result detected via observer ({entry['selector']}): {number} ({color})")
+                return result
+            entry = self.observer.next_entry(wait=False)
+        
+        return None
+    
     def _is_valid_number(self, text: str) -> bool:
         try:
             number = int(text)
@@ -224,16 +318,9 @@ class WorkingRouletteCollector:
         except ValueError:
             return False
     
-    def _is_new_result(self, result: RouletteResult) -> bool:
-        if not self.last_result:
-            return True
-        
-        # Check if it's the same number and within a short time window
-        if (result.number == self.last_result.number and 
-            (result.timestamp - self.last_result.timestamp).seconds < 30):
-            return False
-        
-        return True
+    def _is_new_result(self, result: RouletteResult, round_id: Optional[str] = None) -> bool:
+        # Checked against persisted state, so a restart doesn't re-emit the last result
+        return not self.dedupe.is_duplicate(result, round_id)
     
     def _get_session_id(self) -> str:
         return datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -244,10 +331,18 @@ class WorkingRouletteCollector:
             
             Config.create_directories()
             
+            self._warm_start()
+            
+            # Serve the local result feed
+            self.feed.start()
+            
             if not self.connect_to_browser():
                 self.logger.error("Failed to connect to browser")
                 return False
             
+            # Probe the browser session in the background
+            self.health.register("browser", lambda: probe_webdriver(self.driver))
+            
             # Send startup notification
             try:
                 self.discord.send_startup_message()
@@ -273,6 +368,15 @@ class WorkingRouletteCollector:
             self.logger.error(f"Failed to start collector: {str(e)}")
             return False
     
+    def _warm_start(self):
+        try:
+            recent = self.store.recent(Config.TABLE_NAME, 1)
+            if recent:
+                self.last_result = recent[-1]
+                self.logger.info(f"Last stored result: {self.last_result.number} ({self.last_result.color})")
+        except Exception as e:
+            self.logger.warning(f"Could not load recent results: {str(e)}")
+    
     def run(self):
         if not self.start():
             return
@@ -280,7 +384,10 @@ class WorkingRouletteCollector:
         try:
             while self.running:
                 self._process_cycle()
-                time.sleep(Config.SCAN_INTERVAL_SECONDS)
+                # A push-mode cycle that blocked in the page has already paced the loop;
+                # anything else (polling, or a push poll that failed fast) sleeps as usual
+                if not self.push_wait:
+                    time.sleep(Config.SCAN_INTERVAL_SECONDS)
                 
         except KeyboardInterrupt:
             self.logger.info("Keyboard interrupt received")
@@ -304,26 +411,24 @@ class WorkingRouletteCollector:
             self.logger.info(f"New result detected: {result.number} ({result.color})")
             self.stats["results_collected"] += 1
             self.last_result = result
+            self.dedupe.record(result, self._detected_round_id)
+            self._detected_round_id = None
             
-            # Send to Discord
-            try:
-                if self.discord.send_result(result):
-                    self.stats["discord_sent"] += 1
-                    self.logger.info("Result sent to Discord successfully")
-                else:
-                    self.logger.error("Failed to send result to Discord")
-                    self.stats["errors"] += 1
-            except Exception as e:
-                self.logger.error(f"Discord error: {str(e)}")
-                self.stats["errors"] += 1
+            # Queue for Discord; delivery happens on background workers
+            if self.discord.enqueue_result(result):
+                self.stats["discord_queued"] += 1
+            else:
+                self.logger.warning("No Discord route accepted the result")
+            
+            # Push to local feed subscribers
+            self.feed.publish(result)
             
             # Send to local HTML
             try:
-                if self.local_html.send_result(result):
-                    self.stats["local_html_sent"] += 1
-                    self.logger.info("Result sent to local HTML successfully")
+                if self.local_html.enqueue_result(result):
+                    self.stats["local_html_queued"] += 1
                 else:
-                    self.logger.warning("Failed to send result to local HTML")
+                    self.logger.warning("Local HTML queue full, result kept in outbox for retry")
             except Exception as e:
                 self.logger.warning(f"Local HTML error: {str(e)}")
             
@@ -336,19 +441,7 @@ class WorkingRouletteCollector:
     
     def _save_result(self, result: RouletteResult):
         try:
-            filename = f"{Config.DATA_DIR}/results_{datetime.now().strftime('%Y%m%d')}.json"
-            
-            try:
-                with open(filename, 'r') as f:
-                    results = json.load(f)
-            except FileNotFoundError:
-                results = []
-            
-            results.append(result.to_dict())
-            
-            with open(filename, 'w') as f:
-                json.dump(results, f, indent=2)
-                
+            self.store.append(result)
         except Exception as e:
             self.logger.error(f"Error saving result to file: {str(e)}")
     
@@ -360,6 +453,20 @@ class WorkingRouletteCollector:
         self.running = False
         
         try:
+            # Deliver queued Discord and local HTML notifications
+            self.discord.close()
+            self.local_html.close()
+            
+            # Stop the local result feed
+            self.feed.stop()
+            
+            # Stop health probes
+            self.health.stop()
+            
+            # Keep what was learned about the selectors for the next run
+            self.selector_stats.save()
+            self.dedupe.save()
+            
             # Send shutdown notification
             try:
                 self.discord.send_shutdown_message()
@@ -374,6 +481,9 @@ class WorkingRouletteCollector:
                 except Exception as e:
                     self.logger.error(f"Error closing browser: {str(e)}")
             
+            # Close result store
+            self.store.close()
+            
             # Print final statistics
             self._print_final_stats()
             self.logger.info("Working Roulette Collector stopped successfully")
@@ -388,8 +498,11 @@ class WorkingRouletteCollector:
         
         self.logger.info("Final Statistics:")
         self.logger.info(f"  Results Collected: {self.stats['results_collected']}")
-        self.logger.info(f"  Discord Sent: {self.stats['discord_sent']}")
-        self.logger.info(f"  Local HTML Sent: {self.stats['local_html_sent']}")
+        self.logger.info(f"  Discord Queued: {self.stats['discord_queued']}")
+        self.logger.info(f"  Discord Delivered: {self.discord.delivered}")
+        self.logger.info(f"  Local HTML Queued: {self.stats['local_html_queued']}")
+        if self.local_html.queue:
+            self.logger.info(f"  Local HTML Delivered: {self.local_html.queue.stats['delivered']}")
         self.logger.info(f"  Errors: {self.stats['errors']}")
 
 def main():